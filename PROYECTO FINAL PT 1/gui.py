@@ -0,0 +1,60 @@
+"""Interfaz gráfica (Tkinter) de main.py: ventana "Analizador Sintáctico Descendente".
+
+Se carga solo al ejecutar python main.py o python gui.py; main.py se
+puede importar sin tkinter ni pantalla.
+"""
+import tkinter as tk
+from tkinter import filedialog
+
+from main import check_source
+
+def open_file():
+    filepath = filedialog.askopenfilename(
+        title="Selecciona el archivo fuente",
+        filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
+    )
+    if filepath:
+        with open(filepath, "r", encoding="utf-8") as file:
+            content = file.read()
+            text_area.delete("1.0", tk.END)
+            text_area.insert(tk.END, content)
+
+# Análisis incremental: solo se re-analizan las sentencias afectadas por la edición
+analyzer = None
+
+def analyze_buffer():
+    global analyzer
+    from incremental import IncrementalAnalyzer
+    if analyzer is None:
+        analyzer = IncrementalAnalyzer()
+    analyzer.update(text_area.get("1.0", tk.END))
+    label_result.config(text=analyzer.result())
+
+# Lista completa de errores (análisis con recuperación)
+def list_errors():
+    diagnostics = check_source(text_area.get("1.0", tk.END))
+    if diagnostics:
+        label_result.config(text="\n".join(str(d) for d in diagnostics), justify=tk.LEFT)
+    else:
+        label_result.config(text="Programa válido.")
+
+def main():
+    global text_area, label_result
+    root = tk.Tk()
+    root.title("Analizador Sintáctico Descendente")
+    frame = tk.Frame(root, padx=10, pady=10)
+    frame.pack()
+    button_open = tk.Button(frame, text="Abrir archivo fuente", command=open_file)
+    button_open.pack(pady=5)
+    text_area = tk.Text(frame, width=40, height=10)
+    text_area.pack(pady=5)
+    button_analyze = tk.Button(frame, text="Analizar programa", command=analyze_buffer)
+    button_analyze.pack(pady=5)
+    button_errors = tk.Button(frame, text="Listar todos los errores", command=list_errors)
+    button_errors.pack(pady=5)
+    label_result = tk.Label(frame, text="Resultado del análisis:")
+    label_result.pack(pady=5)
+    root.mainloop()
+
+if __name__ == '__main__':
+    main()
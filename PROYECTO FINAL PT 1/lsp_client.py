@@ -0,0 +1,156 @@
+"""Cliente LSP mínimo por stdio para probar lsp_server.py y medir su latencia.
+
+Arranca el servidor como subproceso, abre un documento y le aplica ediciones
+que alternan entre un programa válido y uno con una variable no declarada.
+Para cada edición mide el tiempo hasta recibir los diagnósticos de esa
+versión (incluye la espera de --debounce) y comprueba que coinciden con
+check_source. Después envía una ráfaga de ediciones seguidas y comprueba que
+solo se publican los diagnósticos de la última.
+
+Uso: python lsp_client.py [archivo] [--edits N] [--scale K] [--burst N] [--debounce S]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from lsp_server import DEBOUNCE, encode_message, read_message, to_lsp_diagnostics
+from main import check_source
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lsp_server.py')
+
+
+class LspClient:
+    def __init__(self, process):
+        self.process = process
+        self.next_id = 0
+        self.responses = {}     # id -> futuro de la respuesta
+        self.published = []     # (momento, params) de cada publishDiagnostics
+        self.changed = asyncio.Event()
+        self.reader_task = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def start(cls, *server_args):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, SERVER_PATH, *server_args,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        return cls(process)
+
+    async def _read(self):
+        while True:
+            message = await read_message(self.process.stdout)
+            if message is None:
+                return
+            if 'id' in message and 'method' not in message:
+                future = self.responses.pop(message['id'])
+                if 'error' in message:
+                    future.set_exception(Exception(message['error']['message']))
+                else:
+                    future.set_result(message.get('result'))
+            elif message.get('method') == 'textDocument/publishDiagnostics':
+                self.published.append((time.perf_counter(), message['params']))
+                self.changed.set()
+
+    def _send(self, message):
+        message['jsonrpc'] = '2.0'
+        self.process.stdin.write(encode_message(message))
+
+    async def request(self, method, params=None):
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.responses[self.next_id] = future
+        self._send({'id': self.next_id, 'method': method, 'params': params})
+        await self.process.stdin.drain()
+        return await future
+
+    async def notify(self, method, params=None):
+        self._send({'method': method, 'params': params})
+        await self.process.stdin.drain()
+
+    async def wait_diagnostics(self, uri, version, timeout=30):
+        """Espera los diagnósticos de esa versión; devuelve (momento, params)."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            for when, params in reversed(self.published):
+                if params['uri'] == uri and params.get('version') == version:
+                    return when, params
+            self.changed.clear()
+            await asyncio.wait_for(self.changed.wait(), max(0.0, deadline - time.perf_counter()))
+
+    async def close(self):
+        await self.request('shutdown')
+        await self.notify('exit')
+        code = await self.process.wait()
+        self.reader_task.cancel()
+        return code
+
+
+def edited(base, i):
+    """Versión i: alterna una sentencia válida y una con variable no declarada."""
+    if i % 2:
+        return base + f'\nvar nueva{i} = {i};\nnueva{i} = nueva{i} + 1;\n'
+    return base + f'\nnueva{i} = {i} * 2;\n'
+
+
+async def run(args):
+    if args.source:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            base = f.read()
+    else:
+        base = 'var x = 5;\nx = x + 3 * (2 + 1);\n'
+    base = '\n'.join([base] * args.scale)
+    uri = 'file:///documento.txt'
+
+    client = await LspClient.start('--debounce', str(args.debounce))
+    await client.request('initialize', {'processId': os.getpid(), 'rootUri': None, 'capabilities': {}})
+    await client.notify('initialized', {})
+    await client.notify('textDocument/didOpen', {'textDocument': {
+        'uri': uri, 'languageId': 'proyecto-final', 'version': 0, 'text': base}})
+    await client.wait_diagnostics(uri, 0)
+
+    latencies = []
+    for version in range(1, args.edits + 1):
+        text = edited(base, version)
+        start = time.perf_counter()
+        await client.notify('textDocument/didChange', {
+            'textDocument': {'uri': uri, 'version': version}, 'contentChanges': [{'text': text}]})
+        when, params = await client.wait_diagnostics(uri, version)
+        latencies.append(when - start)
+        if params['diagnostics'] != to_lsp_diagnostics(text, check_source(text)):
+            raise SystemExit(f'Error: diagnósticos distintos de check_source en la versión {version}')
+
+    published_before = len(client.published)
+    first = args.edits + 1
+    last = args.edits + args.burst
+    for version in range(first, last + 1):
+        await client.notify('textDocument/didChange', {
+            'textDocument': {'uri': uri, 'version': version}, 'contentChanges': [{'text': edited(base, version)}]})
+    await client.wait_diagnostics(uri, last)
+    burst_published = len(client.published) - published_before
+    if await client.close() != 0:
+        raise SystemExit('Error: el servidor no terminó con código 0')
+
+    latencies.sort()
+    print(f'{len(base)} caracteres, {args.edits} ediciones, debounce {args.debounce * 1000:.0f} ms')
+    print(f'latencia edición -> diagnósticos: mediana {statistics.median(latencies) * 1000:.1f} ms'
+          f'  p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms'
+          f'  máx {latencies[-1] * 1000:.1f} ms')
+    print(f'ráfaga de {args.burst} ediciones: {burst_published} publicación(es)')
+    if burst_published != 1:
+        raise SystemExit('Error: se publicaron diagnósticos de versiones obsoletas')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Prueba y mide lsp_server.py.')
+    arg_parser.add_argument('source', nargs='?', help='documento inicial (por defecto un programa corto)')
+    arg_parser.add_argument('--edits', type=int, default=20, help='ediciones espaciadas a medir')
+    arg_parser.add_argument('--scale', type=int, default=1, help='repite el documento K veces')
+    arg_parser.add_argument('--burst', type=int, default=10, help='ediciones seguidas sin esperar')
+    arg_parser.add_argument('--debounce', type=float, default=DEBOUNCE)
+    asyncio.run(run(arg_parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
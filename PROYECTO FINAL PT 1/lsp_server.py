@@ -0,0 +1,225 @@
+"""Servidor LSP (Language Server Protocol) por stdio para el lenguaje del proyecto.
+
+Publica como diagnósticos los errores de check_source (sintácticos, léxicos y
+variables no declaradas), cada uno con el rango exacto del token señalado.
+Los documentos se sincronizan completos (cada didChange trae el texto entero).
+
+Cada cambio programa un análisis tras DEBOUNCE segundos; si llega otro
+cambio antes, el análisis pendiente se cancela. El análisis corre en un
+executor de un solo hilo para no bloquear el bucle de asyncio: un análisis
+cancelado que aún no empezó no llega a ejecutarse, y el resultado de uno que
+ya empezó se descarta si el documento cambió de versión mientras tanto.
+
+Uso: python lsp_server.py [--debounce SEGUNDOS]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from main import check_source
+
+DEBOUNCE = 0.15
+SEVERITY_ERROR = 1
+TEXT_SYNC_FULL = 1
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+
+async def read_message(reader):
+    """Lee un mensaje con cabecera Content-Length; None si se cerró la entrada."""
+    length = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode('ascii').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    if length is None:
+        raise Exception('Mensaje sin cabecera Content-Length')
+    return json.loads(await reader.readexactly(length))
+
+
+def encode_message(message):
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    return b'Content-Length: %d\r\n\r\n' % len(body) + body
+
+
+def utf16_column(line_text, column):
+    """Columna en unidades UTF-16 (las que usa LSP) de la columna column (base 0)."""
+    if line_text.isascii():
+        return column
+    return column + sum(1 for char in line_text[:column] if ord(char) > 0xFFFF)
+
+
+def to_lsp_diagnostics(text, diagnostics):
+    lines = text.split('\n')
+    result = []
+    for d in diagnostics:
+        line = d.line - 1
+        line_text = lines[line] if line < len(lines) else ''
+        start = utf16_column(line_text, d.column - 1)
+        end = utf16_column(line_text, d.column - 1 + d.length)
+        result.append({
+            'range': {'start': {'line': line, 'character': start},
+                      'end': {'line': line, 'character': end}},
+            'severity': SEVERITY_ERROR,
+            'source': 'proyecto-final',
+            'message': d.message,
+        })
+    return result
+
+
+class LanguageServer:
+    def __init__(self, write, debounce=DEBOUNCE):
+        self.write = write
+        self.debounce = debounce
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.documents = {}   # uri -> (versión, texto)
+        self.pending = {}     # uri -> tarea de análisis programada
+        self.shutdown_received = False
+        self.handlers = {
+            'initialize': self.initialize,
+            'shutdown': self.shutdown,
+            'textDocument/didOpen': self.did_open,
+            'textDocument/didChange': self.did_change,
+            'textDocument/didClose': self.did_close,
+        }
+
+    def send(self, message):
+        message['jsonrpc'] = '2.0'
+        self.write(encode_message(message))
+
+    async def serve(self, reader):
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None or message.get('method') == 'exit':
+                    break
+                self.dispatch(message)
+        finally:
+            for task in self.pending.values():
+                task.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def dispatch(self, message):
+        method = message.get('method')
+        if method is None:
+            return  # respuesta a una petición nuestra: no enviamos ninguna
+        handler = self.handlers.get(method)
+        if 'id' not in message:
+            # Notificación: las desconocidas ($/cancelRequest, initialized...) se ignoran.
+            # No hay a quién responder, así que un error solo se registra en stderr
+            if handler is not None:
+                try:
+                    handler(message.get('params'))
+                except Exception as e:
+                    print(f'Error en {method}: {e!r}', file=sys.stderr)
+            return
+        if handler is None:
+            self.send({'id': message['id'], 'error': {'code': METHOD_NOT_FOUND,
+                                                      'message': f'Método no soportado: {method}'}})
+            return
+        try:
+            result = handler(message.get('params'))
+        except Exception as e:
+            self.send({'id': message['id'], 'error': {'code': INTERNAL_ERROR, 'message': str(e)}})
+            return
+        self.send({'id': message['id'], 'result': result})
+
+    def initialize(self, params):
+        return {
+            'capabilities': {'textDocumentSync': {'openClose': True, 'change': TEXT_SYNC_FULL}},
+            'serverInfo': {'name': 'proyecto-final-lsp'},
+        }
+
+    def shutdown(self, params):
+        self.shutdown_received = True
+        return None
+
+    def did_open(self, params):
+        document = params['textDocument']
+        self.update(document['uri'], document.get('version', 0), document['text'])
+
+    def did_change(self, params):
+        document = params['textDocument']
+        # Sincronización completa: el último cambio contiene el texto entero
+        self.update(document['uri'], document['version'], params['contentChanges'][-1]['text'])
+
+    def did_close(self, params):
+        uri = params['textDocument']['uri']
+        self.documents.pop(uri, None)
+        task = self.pending.pop(uri, None)
+        if task is not None:
+            task.cancel()
+        self.send({'method': 'textDocument/publishDiagnostics',
+                   'params': {'uri': uri, 'diagnostics': []}})
+
+    def update(self, uri, version, text):
+        self.documents[uri] = (version, text)
+        task = self.pending.get(uri)
+        if task is not None:
+            task.cancel()
+        self.pending[uri] = asyncio.get_running_loop().create_task(self.analyze(uri, version, text))
+
+    async def analyze(self, uri, version, text):
+        await asyncio.sleep(self.debounce)
+        loop = asyncio.get_running_loop()
+        diagnostics = await loop.run_in_executor(self.executor, check_source, text)
+        if self.documents.get(uri, (None,))[0] != version:
+            return  # el documento cambió mientras se analizaba
+        del self.pending[uri]
+        self.send({'method': 'textDocument/publishDiagnostics',
+                   'params': {'uri': uri, 'version': version,
+                              'diagnostics': to_lsp_diagnostics(text, diagnostics)}})
+
+
+async def stdin_reader():
+    """StreamReader alimentado por un hilo que lee stdin (funciona también en Windows)."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+
+    def pump():
+        stdin = sys.stdin.buffer
+        while True:
+            data = stdin.read1(1 << 16)
+            if not data:
+                break
+            loop.call_soon_threadsafe(reader.feed_data, data)
+        loop.call_soon_threadsafe(reader.feed_eof)
+
+    threading.Thread(target=pump, daemon=True).start()
+    return reader
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Servidor LSP por stdio.')
+    arg_parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                            help='segundos de espera tras un cambio antes de analizar')
+    args = arg_parser.parse_args()
+    stdout = sys.stdout.buffer
+
+    def write(data):
+        stdout.write(data)
+        stdout.flush()
+
+    server = LanguageServer(write, args.debounce)
+
+    async def run():
+        await server.serve(await stdin_reader())
+
+    asyncio.run(run())
+    # El hilo de stdin puede seguir bloqueado en read1: se sale sin esperarlo.
+    # Según LSP el código es 0 solo si 'exit' llegó después de 'shutdown'
+    os._exit(0 if server.shutdown_received else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,29 @@
-import tkinter as tk
-from tkinter import filedialog
+import re
+from bisect import bisect_right
 
 # Definición de los tipos de tokens
 INTEGER, ID, PLUS, MINUS, TIMES, DIVIDE, LPAREN, RPAREN, ASSIGN, SEMICOLON, EOF = (
     'INTEGER', 'ID', 'PLUS', 'MINUS', 'TIMES', 'DIVIDE', 'LPAREN', 'RPAREN', 'ASSIGN', 'SEMICOLON', 'EOF'
 )
 
-# Palabras reservadas
+# Palabras reservadas y tipos C++ mapeados a VAR (igual que en la parte 2)
 RESERVED_KEYWORDS = {
     'if': 'IF',
     'else': 'ELSE',
     'while': 'WHILE',
     'for': 'FOR',
-    'var': 'VAR'
+    'var': 'VAR',
+    'int': 'VAR',
+    'float': 'VAR',
+    'double': 'VAR'
 }
 
 class Token:
-    def __init__(self, type, value):
+    def __init__(self, type, value, pos=None, end=None):
         self.type = type
         self.value = value
+        self.pos = pos  # posición del primer carácter en el texto fuente
+        self.end = end  # posición tras el último carácter
     def __str__(self):
         return f'Token({self.type}, {repr(self.value)})'
     def __repr__(self):
@@ -48,12 +53,13 @@ class Lexer:
             self.advance()
 
     def identifier(self):
+        start = self.pos
         result = ''
         while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'):
             result += self.current_char
             self.advance()
         token_type = RESERVED_KEYWORDS.get(result, ID)
-        return Token(token_type, result)
+        return Token(token_type, result, start, self.pos)
 
     def integer(self):
         result = ''
@@ -70,44 +76,128 @@ class Lexer:
                 self.skip_comment(); continue
             if self.current_char.isalpha():
                 return self.identifier()
+            start = self.pos
             if self.current_char.isdigit():
-                return Token(INTEGER, self.integer())
-            if self.current_char == '+': self.advance(); return Token(PLUS, '+')
-            if self.current_char == '-': self.advance(); return Token(MINUS, '-')
-            if self.current_char == '*': self.advance(); return Token(TIMES, '*')
-            if self.current_char == '/': self.advance(); return Token(DIVIDE, '/')
-            if self.current_char == '(': self.advance(); return Token(LPAREN, '(')
-            if self.current_char == ')': self.advance(); return Token(RPAREN, ')')
-            if self.current_char == '=': self.advance(); return Token(ASSIGN, '=')
-            if self.current_char == ';': self.advance(); return Token(SEMICOLON, ';')
+                return Token(INTEGER, self.integer(), start, self.pos)
+            if self.current_char == '+': self.advance(); return Token(PLUS, '+', start, self.pos)
+            if self.current_char == '-': self.advance(); return Token(MINUS, '-', start, self.pos)
+            if self.current_char == '*': self.advance(); return Token(TIMES, '*', start, self.pos)
+            if self.current_char == '/': self.advance(); return Token(DIVIDE, '/', start, self.pos)
+            if self.current_char == '(': self.advance(); return Token(LPAREN, '(', start, self.pos)
+            if self.current_char == ')': self.advance(); return Token(RPAREN, ')', start, self.pos)
+            if self.current_char == '=': self.advance(); return Token(ASSIGN, '=', start, self.pos)
+            if self.current_char == ';': self.advance(); return Token(SEMICOLON, ';', start, self.pos)
             self.error()
-        return Token(EOF, None)
+        return Token(EOF, None, self.pos, self.pos)
+
+# Índice de inicios de línea: posición -> (línea, columna) con búsqueda binaria
+class LineIndex:
+    def __init__(self, text):
+        self.starts = [0] + [mo.end() for mo in re.finditer('\n', text)]
+
+    def position(self, pos):
+        line = bisect_right(self.starts, pos) - 1
+        return line + 1, pos - self.starts[line] + 1
+
+class Diagnostic:
+    # length: caracteres del token señalado (0 al final del archivo)
+    def __init__(self, line, column, message, length=1):
+        self.line = line
+        self.column = column
+        self.message = message
+        self.length = length
+    def __str__(self):
+        return f'Línea {self.line}, columna {self.column}: {self.message}'
+    def __repr__(self):
+        return f'Diagnostic({self.line}, {self.column}, {self.message!r})'
+
+class ParseError(Exception):
+    def __init__(self, message, pos, end=None):
+        super().__init__(message)
+        self.pos = pos
+        self.end = pos + 1 if end is None else end
 
 class Parser:
-    def __init__(self, lexer):
+    # recover: en lugar de detenerse en el primer error, lo anota en
+    # self.diagnostics y se sincroniza (modo pánico) con el siguiente ';',
+    # el siguiente 'var' o un identificador al inicio de otra línea
+    def __init__(self, lexer, recover=False):
         self.lexer = lexer
-        self.current_token = lexer.get_next_token()
+        self.recover = recover
+        self.diagnostics = []
+        self.lines = LineIndex(lexer.text) if recover else None
+        self.current_token = self.next_token()
         self.symbols = set()  # tabla de símbolos
 
+    def next_token(self):
+        if not self.recover:
+            return self.lexer.get_next_token()
+        while True:
+            try:
+                return self.lexer.get_next_token()
+            except Exception:
+                # Error léxico: se anota y se salta el carácter inválido
+                char = self.lexer.current_char
+                self.report(f"Error léxico: carácter inesperado {char!r}", self.lexer.pos, self.lexer.pos + 1)
+                self.lexer.advance()
+
+    def report(self, message, pos, end):
+        line, column = self.lines.position(pos)
+        self.diagnostics.append(Diagnostic(line, column, message, end - pos))
+
     def error(self, msg="Error de sintaxis"):
-        raise Exception(msg + f" en token {self.current_token}")
+        raise ParseError(msg + f" en token {self.current_token}", self.current_token.pos, self.current_token.end)
+
+    def semantic_error(self, msg):
+        # Los errores semánticos no desincronizan el análisis: en modo
+        # recuperación se anotan y se sigue con la misma sentencia
+        if not self.recover:
+            self.error(msg)
+        self.report(msg + f" en token {self.current_token}", self.current_token.pos, self.current_token.end)
+
+    def synchronize(self, error_pos):
+        error_line = self.lines.position(error_pos)[0]
+        while self.current_token.type != EOF:
+            if self.current_token.type == SEMICOLON:
+                self.current_token = self.next_token()
+                return
+            if self.current_token.type == 'VAR':
+                return
+            if self.current_token.type == ID and self.lines.position(self.current_token.pos)[0] > error_line:
+                return
+            self.current_token = self.next_token()
 
     def eat(self, token_type):
         if self.current_token.type == token_type:
-            self.current_token = self.lexer.get_next_token()
+            self.current_token = self.next_token()
         else:
             self.error(f"Se esperaba token {token_type}")
 
     # Programa → ListaDeSentencias EOF
     def program(self):
         self.statement_list()
-        if self.current_token.type != EOF:
-            self.error("Se esperaba fin de archivo")
+        while self.current_token.type != EOF:
+            try:
+                self.error("Se esperaba fin de archivo")
+            except ParseError as e:
+                if not self.recover:
+                    raise
+                self.report(str(e), e.pos, e.end)
+                # Se descarta al menos el token inesperado
+                self.current_token = self.next_token()
+                self.synchronize(e.pos)
+            self.statement_list()
 
     # ListaDeSentencias → Sentencia ListaDeSentencias | ε
     def statement_list(self):
         while self.current_token.type in (ID, 'VAR'):
-            self.statement()
+            try:
+                self.statement()
+            except ParseError as e:
+                if not self.recover:
+                    raise
+                self.report(str(e), e.pos, e.end)
+                self.synchronize(e.pos)
 
     # Sentencia → VAR ID (= Expr)? ;  | ID = Expr ;
     def statement(self):
@@ -116,55 +206,54 @@ class Parser:
             self.eat('VAR')
             var_name = self.current_token.value
             self.eat(ID)
-            # opcional inicializador
-            if self.current_token.type == ASSIGN:
-                self.eat(ASSIGN)
-                self.expr()
-            self.eat(SEMICOLON)
-            self.symbols.add(var_name)
+            try:
+                # opcional inicializador
+                if self.current_token.type == ASSIGN:
+                    self.eat(ASSIGN)
+                    self.expr()
+                self.eat(SEMICOLON)
+            finally:
+                # Aunque la sentencia tenga errores la variable queda declarada,
+                # para no repetir errores en sus usos posteriores
+                self.symbols.add(var_name)
         else:
             # Asignación a variable existente
             var_name = self.current_token.value
             if var_name not in self.symbols:
-                self.error(f"Variable '{var_name}' no declarada")
+                self.semantic_error(f"Variable '{var_name}' no declarada")
             self.eat(ID)
             self.eat(ASSIGN)
             self.expr()
             self.eat(SEMICOLON)
             # ya estaba declarada, no volvemos a agregar
 
-    # Expr → Term ExprRest
+    # Expr → Term ExprRest,  Term → Factor TermRest,  Factor → ( Expr ) | INTEGER | ID
     def expr(self):
-        self.term()
-        self.expr_rest()
-
-    def expr_rest(self):
-        while self.current_token.type in (PLUS, MINUS):
+        # Se analiza con un contador de paréntesis abiertos en lugar de recursión,
+        # así que la profundidad solo está limitada por la memoria. Para reconocer
+        # la expresión la precedencia no importa: basta alternar operandos y
+        # operadores, igual que ExprRest/TermRest.
+        depth = 0
+        while True:
+            while self.current_token.type == LPAREN:
+                self.eat(LPAREN)
+                depth += 1
+            self.operand()
+            while self.current_token.type not in (PLUS, MINUS, TIMES, DIVIDE):
+                if depth == 0:
+                    return
+                self.eat(RPAREN)
+                depth -= 1
             self.eat(self.current_token.type)
-            self.term()
-
-    # Term → Factor TermRest
-    def term(self):
-        self.factor()
-        self.term_rest()
 
-    def term_rest(self):
-        while self.current_token.type in (TIMES, DIVIDE):
-            self.eat(self.current_token.type)
-            self.factor()
-
-    # Factor → ( Expr ) | INTEGER | ID
-    def factor(self):
-        if self.current_token.type == LPAREN:
-            self.eat(LPAREN)
-            self.expr()
-            self.eat(RPAREN)
-        elif self.current_token.type == INTEGER:
+    # Operando → INTEGER | ID
+    def operand(self):
+        if self.current_token.type == INTEGER:
             self.eat(INTEGER)
         elif self.current_token.type == ID:
             name = self.current_token.value
             if name not in self.symbols:
-                raise Exception(f"Variable '{name}' no declarada en token {self.current_token}")
+                self.semantic_error(f"Variable '{name}' no declarada")
             self.eat(ID)
         else:
             self.error("Se esperaba '(', número o identificador")
@@ -179,28 +268,13 @@ def parse_source(source_code):
     except Exception as e:
         return f"Error: {e}"
 
-# Interfaz gráfica con Tkinter
-def open_file():
-    filepath = filedialog.askopenfilename(
-        title="Selecciona el archivo fuente",
-        filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
-    )
-    if filepath:
-        with open(filepath, "r", encoding="utf-8") as file:
-            content = file.read()
-            text_area.delete("1.0", tk.END)
-            text_area.insert(tk.END, content)
-
-root = tk.Tk()
-root.title("Analizador Sintáctico Descendente")
-frame = tk.Frame(root, padx=10, pady=10)
-frame.pack()
-button_open = tk.Button(frame, text="Abrir archivo fuente", command=open_file)
-button_open.pack(pady=5)
-text_area = tk.Text(frame, width=40, height=10)
-text_area.pack(pady=5)
-button_analyze = tk.Button(frame, text="Analizar programa", command=lambda: label_result.config(text=parse_source(text_area.get("1.0", tk.END))))
-button_analyze.pack(pady=5)
-label_result = tk.Label(frame, text="Resultado del análisis:")
-label_result.pack(pady=5)
-root.mainloop()
\ No newline at end of file
+# Análisis con recuperación: lista de todos los errores en una sola pasada
+def check_source(source_code):
+    parser = Parser(Lexer(source_code), recover=True)
+    parser.program()
+    return parser.diagnostics
+
+# La interfaz gráfica está en gui.py y solo se carga al ejecutar el script
+if __name__ == '__main__':
+    import gui
+    gui.main()
@@ -0,0 +1,46 @@
+"""Interfaz gráfica (Tkinter) de main.py: ventana "Analizador Sintáctico Predictivo".
+
+Se carga solo al ejecutar python main.py o python gui.py; main.py se
+puede importar sin tkinter ni pantalla.
+"""
+import tkinter as tk
+
+from main import lexer
+
+# Analizador LL(1) dirigido por tabla (ll1.py); la tabla se carga de disco una vez
+ll1_parser = None
+
+def parse_input():
+    global ll1_parser
+    expression = entry.get()  # Obtiene la expresión
+    try:
+        tokens = lexer(expression)  # Tokeniza
+        if ll1_parser is None:
+            from ll1 import LL1Parser
+            ll1_parser = LL1Parser()
+        ll1_parser.parse(tokens)  # Analiza con pila explícita, sin límite de recursión
+        result_label.config(text="La expresión es válida.", fg="green")  # Muestra éxito
+    except (SyntaxError, ValueError) as e:
+        result_label.config(text=f"Error: {e}", fg="red")  # Muestra error
+
+def main():
+    global entry, result_label
+    root = tk.Tk()  # Crea ventana principal
+    root.title("Analizador Sintáctico Predictivo")
+
+    label = tk.Label(root, text="Ingresa una expresión:")  # Etiqueta de entrada
+    label.pack(pady=5)
+
+    entry = tk.Entry(root, width=40)  # Caja de texto
+    entry.pack(pady=5)
+
+    button = tk.Button(root, text="Analizar", command=parse_input)  # Botón de análisis
+    button.pack(pady=5)
+
+    result_label = tk.Label(root, text="", font=("Helvetica", 12))  # Etiqueta de resultado
+    result_label.pack(pady=10)
+
+    root.mainloop()  # Inicia la interfaz
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Analizador predictivo LL(1) dirigido por tabla.
+
+La gramática se declara como datos (GRAMMAR); a partir de ella se calculan
+los conjuntos FIRST y FOLLOW y la tabla LL(1), que se guarda en disco junto
+con un hash de la gramática y se reutiliza mientras la gramática no cambie.
+El análisis usa una pila explícita, así que la longitud de la entrada solo
+está limitada por la memoria y no por el límite de recursión de Python.
+
+Los mensajes de error son los mismos que los de Parser en main.py: como en
+sus métodos Ep y Tp, un no terminal que deriva ε lo aplica ante cualquier
+token que no tenga entrada en la tabla, y el error aparece al emparejar el
+siguiente terminal.
+
+Uso: python ll1.py  (imprime FIRST, FOLLOW y la tabla)
+"""
+import hashlib
+import json
+import os
+
+END = '$'
+EPSILON = 'ε'
+
+# Producciones (lado izquierdo, lado derecho); () es ε. La primera define el símbolo inicial.
+GRAMMAR = (
+    ('E', ('T', "E'")),
+    ("E'", ('PLUS', 'T', "E'")),
+    ("E'", ('MINUS', 'T', "E'")),
+    ("E'", ()),
+    ('T', ('F', "T'")),
+    ("T'", ('MUL', 'F', "T'")),
+    ("T'", ('DIV', 'F', "T'")),
+    ("T'", ()),
+    ('F', ('LPAREN', 'E', 'RPAREN')),
+    ('F', ('INT',)),
+)
+
+# Cómo se nombra cada terminal en los mensajes de "Se esperaba ..."
+DESCRIPTIONS = {'INT': 'número', 'LPAREN': "'('", 'RPAREN': "')'",
+                'PLUS': "'+'", 'MINUS': "'-'", 'MUL': "'*'", 'DIV': "'/'"}
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'll1_table.json')
+
+
+def nonterminals(grammar):
+    return list(dict.fromkeys(lhs for lhs, _ in grammar))
+
+
+def terminals(grammar):
+    heads = set(nonterminals(grammar))
+    found = [symbol for _, rhs in grammar for symbol in rhs if symbol not in heads]
+    return list(dict.fromkeys(found)) + [END]
+
+
+def first_of(sequence, first):
+    """FIRST de una secuencia de símbolos (incluye EPSILON si puede derivar ε)."""
+    result = set()
+    for symbol in sequence:
+        symbol_first = first.get(symbol, {symbol})
+        result |= symbol_first - {EPSILON}
+        if EPSILON not in symbol_first:
+            return result
+    result.add(EPSILON)
+    return result
+
+
+def first_sets(grammar):
+    first = {a: set() for a in nonterminals(grammar)}
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs in grammar:
+            new = first_of(rhs, first) - first[lhs]
+            if new:
+                first[lhs] |= new
+                changed = True
+    return first
+
+
+def follow_sets(grammar, first):
+    heads = nonterminals(grammar)
+    follow = {a: set() for a in heads}
+    follow[heads[0]].add(END)
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs in grammar:
+            for i, symbol in enumerate(rhs):
+                if symbol not in follow:
+                    continue
+                rest = first_of(rhs[i + 1:], first)
+                new = rest - {EPSILON}
+                if EPSILON in rest:
+                    new |= follow[lhs]
+                new -= follow[symbol]
+                if new:
+                    follow[symbol] |= new
+                    changed = True
+    return follow
+
+
+def build_table(grammar):
+    """Tabla LL(1): no terminal -> {terminal: índice de producción}.
+
+    Lanza ValueError si la gramática no es LL(1).
+    """
+    first = first_sets(grammar)
+    follow = follow_sets(grammar, first)
+    table = {a: {} for a in first}
+    for index, (lhs, rhs) in enumerate(grammar):
+        lookahead = first_of(rhs, first)
+        if EPSILON in lookahead:
+            lookahead = (lookahead - {EPSILON}) | follow[lhs]
+        for terminal in lookahead:
+            previous = table[lhs].setdefault(terminal, index)
+            if previous != index:
+                raise ValueError(f"La gramática no es LL(1): conflicto en [{lhs}, {terminal}] "
+                                 f"entre las producciones {previous} y {index}")
+    return table
+
+
+def grammar_hash(grammar):
+    return hashlib.sha256(json.dumps(grammar).encode('utf-8')).hexdigest()
+
+
+def load_table(grammar=GRAMMAR, path=TABLE_PATH):
+    """Tabla de grammar desde path si corresponde a la misma gramática; si no, la
+    construye y la guarda (de forma atómica) para el próximo arranque."""
+    key = grammar_hash(grammar)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('grammar') == key:
+            return data['table']
+    except (OSError, ValueError):
+        pass
+    table = build_table(grammar)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'grammar': key, 'table': table}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Sin permiso de escritura se trabaja con la tabla en memoria
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return table
+
+
+class LL1Parser:
+    def __init__(self, grammar=GRAMMAR, table=None):
+        self.productions = [rhs for _, rhs in grammar]
+        self.start = grammar[0][0]
+        self.table = table if table is not None else load_table(grammar)
+        # Producción ε de cada no terminal que la tenga (acción por defecto)
+        self.defaults = {lhs: index for index, (lhs, rhs) in enumerate(grammar) if not rhs}
+        # Orden de los terminales en los mensajes: el de DESCRIPTIONS
+        self.order = {t: i for i, t in enumerate(dict.fromkeys([*DESCRIPTIONS, *terminals(grammar)]))}
+
+    def error(self, message):
+        raise SyntaxError(message)
+
+    def expected(self, nonterminal, found):
+        names = sorted(self.table[nonterminal], key=self.order.__getitem__)
+        described = ' o '.join(DESCRIPTIONS.get(t, f"'{t}'") for t in names)
+        self.error(f"Se esperaba {described}, se encontró '{found}'.")
+
+    def parse(self, tokens):
+        """Analiza una lista de tokens (con atributo type) terminada en '$'."""
+        table, defaults, productions = self.table, self.defaults, self.productions
+        stack = [END, self.start]
+        pos = 0
+        count = len(tokens)
+        while True:
+            top = stack.pop()
+            kind = tokens[pos].type if pos < count else END
+            row = table.get(top)
+            if row is not None:
+                index = row.get(kind)
+                if index is None:
+                    index = defaults.get(top)
+                    if index is None:
+                        self.expected(top, kind)
+                stack.extend(reversed(productions[index]))
+            elif top == kind:
+                if top == END:
+                    return
+                pos += 1
+            elif top == END:
+                self.error("Fin de la expresión esperado.")
+            else:
+                self.error(f"Se esperaba '{top}', se encontró '{kind}'.")
+
+
+def main():
+    first = first_sets(GRAMMAR)
+    follow = follow_sets(GRAMMAR, first)
+    table = load_table()
+    for a in nonterminals(GRAMMAR):
+        print(f"FIRST({a}) = {sorted(first[a])}   FOLLOW({a}) = {sorted(follow[a])}")
+    print()
+    for a, row in table.items():
+        cells = ', '.join(f"{t}: {' '.join(GRAMMAR[i][1]) or EPSILON}" for t, i in row.items())
+        print(f"{a:<3} {cells}")
+
+
+if __name__ == '__main__':
+    main()
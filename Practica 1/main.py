@@ -1,5 +1,4 @@
 import re
-import tkinter as tk
 
 class Token:
     def __init__(self, type_, value=None):
@@ -126,29 +125,7 @@ class Parser:
         else:
             self.error(f"Se esperaba número o '(', se encontró '{self.current_token.type}'.")  # Error
 
-def parse_input():
-    expression = entry.get()  # Obtiene la expresión
-    try:
-        tokens = lexer(expression)  # Tokeniza
-        parser = Parser(tokens)  # Crea parser
-        parser.parse()  # Analiza sintácticamente
-        result_label.config(text="La expresión es válida.", fg="green")  # Muestra éxito
-    except (SyntaxError, ValueError) as e:
-        result_label.config(text=f"Error: {e}", fg="red")  # Muestra error
-
-root = tk.Tk()  # Crea ventana principal
-root.title("Analizador Sintáctico Predictivo")
-
-label = tk.Label(root, text="Ingresa una expresión:")  # Etiqueta de entrada
-label.pack(pady=5)
-
-entry = tk.Entry(root, width=40)  # Caja de texto
-entry.pack(pady=5)
-
-button = tk.Button(root, text="Analizar", command=parse_input)  # Botón de análisis
-button.pack(pady=5)
-
-result_label = tk.Label(root, text="", font=("Helvetica", 12))  # Etiqueta de resultado
-result_label.pack(pady=10)
-
-root.mainloop()  # Inicia la interfaz
+# La interfaz gráfica está en gui.py y solo se carga al ejecutar el script
+if __name__ == '__main__':
+    import gui
+    gui.main()
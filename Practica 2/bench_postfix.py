@@ -0,0 +1,123 @@
+"""Escalabilidad de parse_expression con expresiones encadenadas muy largas.
+
+Compara el Parser actual (emite la postfija en una lista que se une una vez)
+con la versión anterior, que concatenaba cadenas en cada operador y por tanto
+copiaba toda la salida acumulada cada vez (tiempo cuadrático).
+
+Uso: python bench_postfix.py [operadores_maximos]
+"""
+import random
+import sys
+import time
+
+from main import Parser, parse_expression
+
+
+class ConcatParser(Parser):
+    """Versión anterior: construye la postfija concatenando cadenas."""
+
+    def number(self):
+        result = ''
+        while self.current_char is not None and self.current_char.isdigit():
+            result += self.current_char
+            self.advance()
+        return result
+
+    def factor(self):
+        self.skip_whitespace()
+        if self.current_char == '(':
+            self.advance()
+            result = self.expr()
+            self.skip_whitespace()
+            if self.current_char == ')':
+                self.advance()
+                return result
+            else:
+                self.error("Se esperaba ')'")
+        elif self.current_char is not None and self.current_char.isdigit():
+            return self.number()
+        else:
+            self.error("Error en factor: se esperaba un número o '('")
+
+    def term(self):
+        self.skip_whitespace()
+        result = self.factor()
+        while self.current_char is not None and self.current_char in ('*', '/'):
+            op = self.current_char
+            self.advance()
+            right = self.factor()
+            result = result + " " + right + " " + op
+        return result
+
+    def expr(self):
+        self.skip_whitespace()
+        result = self.term()
+        while self.current_char is not None and self.current_char in ('+', '-'):
+            op = self.current_char
+            self.advance()
+            right = self.term()
+            result = result + " " + right + " " + op
+        return result
+
+    def postfix(self):
+        return self.expr()
+
+
+def concat_parse_expression(expression):
+    parser = ConcatParser(expression)
+    try:
+        postfix = parser.postfix()
+        parser.skip_whitespace()
+        if parser.current_char is not None:
+            raise Exception("Entrada extra no válida")
+        return postfix
+    except Exception as e:
+        return "Error: " + str(e)
+
+
+def generate_expression(operators, seed=0):
+    """Expresión válida con operators operadores y algunos paréntesis."""
+    rng = random.Random(seed)
+    parts = [str(rng.randint(0, 999))]
+    open_parens = 0
+    for _ in range(operators):
+        parts.append(rng.choice('+-*/'))
+        if rng.random() < 0.1:
+            parts.append('(')
+            open_parens += 1
+        parts.append(str(rng.randint(0, 999)))
+        if open_parens and rng.random() < 0.2:
+            parts.append(')')
+            open_parens -= 1
+    parts.append(')' * open_parens)
+    # Sin espacios: el Parser no los admite entre un operando y el operador siguiente
+    return ''.join(parts)
+
+
+def measure(function, expression):
+    start = time.perf_counter()
+    result = function(expression)
+    return result, time.perf_counter() - start
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    # La versión anterior es cuadrática: solo se mide hasta un tamaño razonable
+    reference_limit = min(limit, 100000)
+    print(f'{"operadores":>10} {"lista (s)":>10} {"us/op":>7} {"concat (s)":>11} {"us/op":>7}')
+    size = 12500
+    while size <= limit:
+        expression = generate_expression(size)
+        result, elapsed = measure(parse_expression, expression)
+        line = f'{size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>7.2f}'
+        if size <= reference_limit:
+            reference, ref_elapsed = measure(concat_parse_expression, expression)
+            if result != reference:
+                raise SystemExit(f'Error: salida distinta con {size} operadores')
+            line += f' {ref_elapsed:>11.3f} {ref_elapsed / size * 1e6:>7.2f}'
+        print(line)
+        size *= 2
+
+
+if __name__ == '__main__':
+    main()
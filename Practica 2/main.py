@@ -1,9 +1,10 @@
-import tkinter as tk
-
 class Parser:
     def __init__(self, input_str):
         self.input = input_str
         self.pos = 0
+        # La notación postfija se emite aquí, un elemento por número u operador,
+        # y se une una sola vez al final (tiempo lineal en el tamaño de la entrada)
+        self.output = []
         self.current_char = self.input[self.pos] if self.input else None
 
     def error(self, msg="Error de sintaxis"):
@@ -24,58 +25,63 @@ class Parser:
 
     def number(self):
         """Reconoce un número (varios dígitos)."""
-        result = ''
+        start = self.pos
         while self.current_char is not None and self.current_char.isdigit():
-            result += self.current_char
             self.advance()
-        return result
+        return self.input[start:self.pos]
 
     def factor(self):
         """F -> (E) | número"""
         self.skip_whitespace()
         if self.current_char == '(':
             self.advance()  # consumir '('
-            result = self.expr()
+            self._expr()
             self.skip_whitespace()
             if self.current_char == ')':
                 self.advance()  # consumir ')'
-                return result
             else:
                 self.error("Se esperaba ')'")
         elif self.current_char is not None and self.current_char.isdigit():
-            num = self.number()
-            return num
+            self.output.append(self.number())
         else:
             self.error("Error en factor: se esperaba un número o '('")
 
     def term(self):
         """T -> F { (* | /) F }"""
         self.skip_whitespace()
-        result = self.factor()
+        self.factor()
         while self.current_char is not None and self.current_char in ('*', '/'):
             op = self.current_char
             self.advance()  # consumir el operador
-            right = self.factor()
+            self.factor()
             # Se genera notación postfija: operandos primero y operador al final
-            result = result + " " + right + " " + op
-        return result
+            self.output.append(op)
 
     def expr(self):
+        """Analiza E y devuelve su forma postfija."""
+        start = len(self.output)
+        self._expr()
+        return " ".join(self.output[start:])
+
+    def _expr(self):
         """E -> T { (+ | -) T }"""
         self.skip_whitespace()
-        result = self.term()
+        self.term()
         while self.current_char is not None and self.current_char in ('+', '-'):
             op = self.current_char
             self.advance()  # consumir el operador
-            right = self.term()
-            result = result + " " + right + " " + op
-        return result
+            self.term()
+            self.output.append(op)
+
+    def postfix(self):
+        """Analiza la expresión y devuelve su forma postfija."""
+        return self.expr()
 
 def parse_expression(expression):
     """Función para parsear la expresión y obtener su forma postfija."""
     parser = Parser(expression)
     try:
-        postfix = parser.expr()
+        postfix = parser.postfix()
         parser.skip_whitespace()
         if parser.current_char is not None:
             raise Exception("Entrada extra no válida")
@@ -83,27 +89,7 @@ def parse_expression(expression):
     except Exception as e:
         return "Error: " + str(e)
 
-# Interfaz de usuario usando Tkinter
-def convert_expression():
-    expr = entry.get()
-    result = parse_expression(expr)
-    label_result.config(text="Notación postfija: " + result)
-
-# Configuración de la ventana principal
-root = tk.Tk()
-root.title("Analizador Descendente - Notación Postfija")
-
-frame = tk.Frame(root, padx=10, pady=10)
-frame.pack()
-
-tk.Label(frame, text="Introduce una expresión aritmética:").pack(pady=5)
-entry = tk.Entry(frame, width=40)
-entry.pack(pady=5)
-
-button = tk.Button(frame, text="Convertir a postfijo", command=convert_expression)
-button.pack(pady=5)
-
-label_result = tk.Label(frame, text="Notación postfija: ")
-label_result.pack(pady=5)
-
-root.mainloop()
\ No newline at end of file
+# La interfaz gráfica está en gui.py y solo se carga al ejecutar el script
+if __name__ == '__main__':
+    import gui
+    gui.main()
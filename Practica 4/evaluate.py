@@ -0,0 +1,282 @@
+"""Evaluación vectorizada de expresiones sobre columnas de datos.
+
+La postfija que produce Parser.parse se compila a un programa de pila
+(apilar columna, apilar constante, aplicar operador). Con NumPy el programa
+se ejecuta una vez por bloque de filas sobre arreglos completos, así que cada
+operador es una sola operación vectorial; los bloques limitan la memoria de
+los resultados intermedios a chunk_size filas por valor de la pila.
+
+Los cálculos son en coma flotante (float64) y '/' es la división real. La
+división por cero sigue una política configurable:
+
+  'error'   lanza ZeroDivisionError indicando la primera fila afectada
+  'nan'     la división vale NaN en esa fila (por defecto)
+  'inf'     resultado IEEE 754: ±inf, o NaN para 0/0
+  número    la división vale ese número en esa fila
+
+En todos los casos el valor sustituye solo al de esa división; el resto de
+la expresión se sigue calculando con él.
+
+NumPy es opcional: sin él sigue disponible evaluate_rows, el bucle por filas
+en Python puro que sirve de referencia.
+
+Uso: python evaluate.py [filas] [expresión]  (filas/s con NumPy frente a Python puro)
+     python evaluate.py --check [semilla]     (compara ambos en las cuatro políticas)
+"""
+import math
+import random
+import sys
+import time
+
+from main import parse_expression
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OPERATORS = ('+', '-', '*', '/')
+PUSH_COLUMN, PUSH_CONST, APPLY = 0, 1, 2
+ZERO_POLICIES = ('error', 'nan', 'inf')
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class StackProgram:
+    """Postfija compilada: instrucciones (tipo, argumento) y columnas que usa."""
+
+    def __init__(self, postfix):
+        self.postfix = postfix
+        self.instructions = []
+        self.variables = []
+        depth = 0
+        self.max_depth = 0
+        for item in postfix.split():
+            if item in OPERATORS:
+                if depth < 2:
+                    raise Exception(f"Postfija mal formada: faltan operandos para '{item}'")
+                depth -= 1
+                self.instructions.append((APPLY, item))
+            elif item.isdigit():
+                depth += 1
+                self.instructions.append((PUSH_CONST, float(item)))
+            else:
+                depth += 1
+                self.instructions.append((PUSH_COLUMN, item))
+                if item not in self.variables:
+                    self.variables.append(item)
+            self.max_depth = max(self.max_depth, depth)
+        if depth != 1:
+            raise Exception('Postfija mal formada: debe quedar exactamente un valor')
+
+    def __repr__(self):
+        return f'StackProgram({self.postfix!r})'
+
+
+def compile_expression(expr_str):
+    """Analiza la expresión con Parser y compila su postfija."""
+    return StackProgram(parse_expression(expr_str))
+
+
+def _check_policy(on_zero):
+    if on_zero not in ZERO_POLICIES and (isinstance(on_zero, str) or not isinstance(on_zero, (int, float))):
+        raise Exception(f"Política de división por cero no válida: {on_zero!r}")
+
+
+def _row_count(program, columns):
+    missing = [name for name in program.variables if name not in columns]
+    if missing:
+        raise Exception(f"Faltan columnas: {', '.join(missing)}")
+    lengths = {len(columns[name]) for name in program.variables}
+    if len(lengths) > 1:
+        raise Exception('Las columnas deben tener la misma longitud')
+    return lengths.pop() if lengths else None
+
+
+def evaluate(program, columns, chunk_size=DEFAULT_CHUNK_SIZE, on_zero='nan', rows=None):
+    """Evalúa program sobre un dict nombre -> arreglo (o secuencia) con NumPy.
+
+    Devuelve un arreglo float64 con un resultado por fila. rows solo hace falta
+    si la expresión no usa ninguna columna.
+    """
+    if np is None:
+        raise ImportError('evaluate necesita NumPy (pip install numpy); evaluate_rows funciona sin él')
+    if isinstance(program, str):
+        program = compile_expression(program)
+    _check_policy(on_zero)
+    count = _row_count(program, columns)
+    if count is None:
+        if rows is None:
+            raise Exception('La expresión no usa columnas: indica el número de filas con rows')
+        count = rows
+    data = {name: np.asarray(columns[name]) for name in program.variables}
+    out = np.empty(count, dtype=np.float64)
+    # Sin avisos por inf/NaN (p. ej. inf - inf con on_zero='inf'), como en Python puro
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, count, chunk_size):
+            end = min(start + chunk_size, count)
+            out[start:end] = _evaluate_chunk(program, data, start, end, on_zero)
+    return out
+
+
+def _evaluate_chunk(program, data, start, end, on_zero):
+    stack = []
+    zero_rows = []
+    push, pop = stack.append, stack.pop
+    for kind, arg in program.instructions:
+        if kind == PUSH_COLUMN:
+            push(data[arg][start:end].astype(np.float64, copy=False))
+        elif kind == PUSH_CONST:
+            push(arg)
+        else:
+            right = pop()
+            left = pop()
+            if arg == '+':
+                push(np.add(left, right))
+            elif arg == '-':
+                push(np.subtract(left, right))
+            elif arg == '*':
+                push(np.multiply(left, right))
+            else:
+                push(_divide(left, right, on_zero, zero_rows))
+    if zero_rows:
+        # La primera fila afectada es la menor de todas las divisiones del bloque,
+        # no la de la primera división que encuentra un cero (igual que evaluate_rows)
+        raise ZeroDivisionError(f'División por cero en la fila {start + min(zero_rows)}')
+    return stack[0]
+
+
+def _divide(left, right, on_zero, zero_rows):
+    result = np.divide(left, right)
+    if on_zero == 'inf':
+        return result
+    zero = np.asarray(right) == 0
+    if not zero.any():
+        return result
+    if on_zero == 'error':
+        zero_rows.append(int(np.argmax(zero)) if zero.ndim else 0)
+        return result
+    fill = math.nan if on_zero == 'nan' else float(on_zero)
+    return np.where(zero, fill, result)
+
+
+def evaluate_rows(program, columns, on_zero='nan', rows=None):
+    """Referencia en Python puro: interpreta el programa fila por fila."""
+    if isinstance(program, str):
+        program = compile_expression(program)
+    _check_policy(on_zero)
+    count = _row_count(program, columns)
+    if count is None:
+        count = rows if rows is not None else 0
+    instructions = program.instructions
+    results = []
+    for row in range(count):
+        stack = []
+        for kind, arg in instructions:
+            if kind == PUSH_COLUMN:
+                stack.append(float(columns[arg][row]))
+            elif kind == PUSH_CONST:
+                stack.append(arg)
+            else:
+                right = stack.pop()
+                left = stack.pop()
+                if arg == '+':
+                    stack.append(left + right)
+                elif arg == '-':
+                    stack.append(left - right)
+                elif arg == '*':
+                    stack.append(left * right)
+                elif right != 0:
+                    stack.append(left / right)
+                elif on_zero == 'error':
+                    raise ZeroDivisionError(f'División por cero en la fila {row}')
+                elif on_zero == 'inf':
+                    # El signo del infinito combina los de left y del cero (±0.0), como en IEEE 754
+                    sign = math.copysign(1.0, left) * math.copysign(1.0, right)
+                    stack.append(math.nan if left == 0 or math.isnan(left) else math.copysign(math.inf, sign))
+                else:
+                    stack.append(math.nan if on_zero == 'nan' else float(on_zero))
+        results.append(stack[0])
+    return results
+
+
+def random_expression(rng, names, depth=3):
+    """Expresión aleatoria con columnas, constantes pequeñas (incluido 0) y paréntesis."""
+    if depth == 0 or rng.random() < 0.25:
+        return rng.choice(names) if rng.random() < 0.7 else str(rng.randint(0, 3))
+    left = random_expression(rng, names, depth - 1)
+    right = random_expression(rng, names, depth - 1)
+    expression = f'{left} {rng.choice(OPERATORS)} {right}'
+    return f'({expression})' if rng.random() < 0.5 else expression
+
+
+def _outcome(function, *args, **kwargs):
+    try:
+        return [float(value) for value in function(*args, **kwargs)]
+    except ZeroDivisionError as e:
+        return f'ZeroDivisionError: {e}'
+
+
+def _same(a, b):
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    return len(a) == len(b) and all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(a, b))
+
+
+def check(expressions=300, rows=50, seed=0):
+    """Compara evaluate con evaluate_rows en las cuatro políticas de división por cero.
+
+    Las columnas tienen muchos ceros y valores negativos (para que aparezcan
+    divisores -0.0) y los bloques son pequeños para que una expresión cruce
+    varios. Devuelve la primera discrepancia (expresión, política, resultados)
+    o None si todo coincide.
+    """
+    rng = random.Random(seed)
+    names = ['a', 'b', 'c']
+    for _ in range(expressions):
+        program = compile_expression(random_expression(rng, names))
+        columns = {name: [rng.randint(-2, 2) for _ in range(rows)] for name in names}
+        arrays = {name: np.asarray(values, dtype=np.int64) for name, values in columns.items()}
+        for on_zero in ZERO_POLICIES + (-1.5,):
+            expected = _outcome(evaluate_rows, program, columns, on_zero=on_zero, rows=rows)
+            actual = _outcome(evaluate, program, arrays, chunk_size=rng.randint(1, rows), on_zero=on_zero, rows=rows)
+            if not _same(actual, expected):
+                return program.postfix, on_zero, actual, expected
+    return None
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--check':
+        if np is None:
+            raise SystemExit('Error: la comprobación necesita NumPy')
+        mismatch = check(seed=int(sys.argv[2]) if len(sys.argv) > 2 else 0)
+        if mismatch:
+            postfix, on_zero, actual, expected = mismatch
+            raise SystemExit(f'Error: {postfix} con on_zero={on_zero!r}\n  NumPy:    {actual}\n  por filas: {expected}')
+        print('NumPy y el bucle por filas coinciden en las cuatro políticas')
+        return
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    expression = sys.argv[2] if len(sys.argv) > 2 else '(precio * cantidad - descuento) / (cantidad - 3) + 100'
+    program = compile_expression(expression)
+    print(f'{expression}  ->  {program.postfix}')
+    rng = random.Random(0)
+    columns = {name: [rng.randint(0, 20) for _ in range(rows)] for name in program.variables}
+
+    start = time.perf_counter()
+    reference = evaluate_rows(program, columns)
+    t_rows = time.perf_counter() - start
+    print(f'Python por filas {t_rows:8.3f} s  {rows / t_rows:14,.0f} filas/s')
+    if np is None:
+        print('NumPy no está instalado: solo se mide el bucle en Python puro')
+        return
+
+    arrays = {name: np.asarray(values, dtype=np.int64) for name, values in columns.items()}
+    start = time.perf_counter()
+    result = evaluate(program, arrays)
+    t_numpy = time.perf_counter() - start
+    print(f'NumPy por bloques {t_numpy:7.3f} s  {rows / t_numpy:14,.0f} filas/s  ({t_rows / t_numpy:.0f}x)')
+    if not np.allclose(result, np.asarray(reference), equal_nan=True):
+        raise SystemExit('Error: NumPy y el bucle por filas no coinciden')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Interfaz gráfica (Tkinter) de main.py: ventana "Analizador Descendente Predictivo - Notación Postfija".
+
+Se carga solo al ejecutar python main.py o python gui.py; main.py se
+puede importar sin tkinter ni pantalla.
+"""
+import tkinter as tk
+
+from main import parse_expression
+
+def convert_expression():
+    expr = entry.get()
+    try:
+        result = parse_expression(expr)
+        label_result.config(text="Notación postfija: " + result)
+    except Exception as e:
+        label_result.config(text="Error: " + str(e))
+
+def main():
+    global entry, label_result
+    root = tk.Tk()
+    root.title("Analizador Descendente Predictivo - Notación Postfija")
+
+    frame = tk.Frame(root, padx=10, pady=10)
+    frame.pack()
+
+    tk.Label(frame, text="Introduce una expresión aritmética:").pack(pady=5)
+    entry = tk.Entry(frame, width=40)
+    entry.pack(pady=5)
+
+    button = tk.Button(frame, text="Convertir a postfijo", command=convert_expression)
+    button.pack(pady=5)
+
+    label_result = tk.Label(frame, text="Notación postfija: ")
+    label_result.pack(pady=5)
+
+    root.mainloop()
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,4 @@
 import re
-import tkinter as tk
 
 class Parser:
     def __init__(self, input_str):
@@ -121,30 +120,7 @@ def parse_expression(expr_str):
     parser = Parser(expr_str)
     return parser.parse()
 
-# --- Interfaz gráfica con Tkinter ---
-
-def convert_expression():
-    expr = entry.get()
-    try:
-        result = parse_expression(expr)
-        label_result.config(text="Notación postfija: " + result)
-    except Exception as e:
-        label_result.config(text="Error: " + str(e))
-
-root = tk.Tk()
-root.title("Analizador Descendente Predictivo - Notación Postfija")
-
-frame = tk.Frame(root, padx=10, pady=10)
-frame.pack()
-
-tk.Label(frame, text="Introduce una expresión aritmética:").pack(pady=5)
-entry = tk.Entry(frame, width=40)
-entry.pack(pady=5)
-
-button = tk.Button(frame, text="Convertir a postfijo", command=convert_expression)
-button.pack(pady=5)
-
-label_result = tk.Label(frame, text="Notación postfija: ")
-label_result.pack(pady=5)
-
-root.mainloop()
+# La interfaz gráfica está en gui.py y solo se carga al ejecutar el script
+if __name__ == '__main__':
+    import gui
+    gui.main()
@@ -0,0 +1,266 @@
+"""Compilador por lotes sin interfaz gráfica.
+
+Genera un archivo de código de 3 direcciones por cada fuente, repartiendo el
+trabajo entre varios procesos. Los errores de cada archivo se acumulan y se
+reportan juntos al final.
+
+Con --incremental se guarda un manifiesto (JSON) con, por cada fuente, el
+hash SHA-256 de su contenido, las opciones, la salida y el hash de la salida
+(o el error), además de la versión del compilador (un hash de sus propios
+archivos). En la siguiente compilación solo se recompilan los archivos cuyo
+contenido, opciones o compilador cambiaron, o cuya salida falta o fue
+modificada; los errores guardados se vuelven a informar sin recompilar. El
+manifiesto se escribe en un archivo temporal y se reemplaza con os.replace,
+así que una compilación interrumpida nunca lo deja a medias.
+
+Uso: python batch.py [-j N] [-o DIR] [-O] [--incremental [--manifest RUTA]] archivo_o_patron [...]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from main import StreamLexer, format_tac, parse_and_generate, stream_tac
+from optimizer import optimize
+
+OUTPUT_SUFFIX = '.tac.txt'
+MANIFEST_NAME = '.tac-manifest.json'
+MANIFEST_FORMAT = 1
+# Archivos de los que depende el código generado: si cambian, cambia la versión
+COMPILER_FILES = ('main.py', 'optimizer.py')
+
+
+def expand_inputs(patterns):
+    """Expande patrones glob (incluido '**') y elimina rutas repetidas."""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in seen and not os.path.isdir(path):
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def output_path(path, output_dir=None):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    directory = output_dir if output_dir is not None else os.path.dirname(path)
+    return os.path.join(directory, stem + OUTPUT_SUFFIX)
+
+
+def compile_file(job):
+    """Compila un archivo; devuelve (ruta, error) con error=None si tuvo éxito.
+
+    El listado se escribe en un archivo temporal que reemplaza a la salida con
+    os.replace solo si todo fue bien: un error nunca deja un listado parcial ni
+    borra el de una compilación anterior.
+    """
+    path, out_path, optimized = job
+    temp_path = f'{out_path}.{os.getpid()}.tmp'
+    try:
+        # La fuente se lee por bloques con StreamLexer, sin cargarla entera en memoria
+        with open(path, 'rb') as f:
+            if optimized:
+                # El optimizador necesita el programa completo, no se puede emitir en streaming
+                code, _ = optimize(parse_and_generate(f, StreamLexer))
+                with open(temp_path, 'w', encoding='utf-8') as out:
+                    out.write(format_tac(code))
+            else:
+                with open(temp_path, 'w', encoding='utf-8') as out:
+                    stream_tac(f, out, StreamLexer)
+        os.replace(temp_path, out_path)
+        return path, None
+    except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return path, str(e)
+
+
+def make_jobs(paths, output_dir=None, optimized=False):
+    jobs = [(path, output_path(path, output_dir), optimized) for path in paths]
+    targets = {}
+    for path, out_path, _ in jobs:
+        if out_path in targets:
+            raise ValueError(f"'{path}' y '{targets[out_path]}' escribirían el mismo archivo {out_path}")
+        targets[out_path] = path
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    return jobs
+
+
+def run_jobs(jobs, workers=None):
+    """Compila los trabajos y produce (ruta, error) de cada uno, en orden."""
+    if workers == 1 or not jobs:
+        yield from map(compile_file, jobs)
+        return
+    chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(compile_file, jobs, chunksize=chunksize)
+
+
+def compile_all(paths, output_dir=None, workers=None, optimized=False):
+    """Compila todas las rutas y devuelve la lista de (ruta, error) fallidos."""
+    jobs = make_jobs(paths, output_dir, optimized)
+    return [(path, error) for path, error in run_jobs(jobs, workers) if error is not None]
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compiler_version():
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in COMPILER_FILES:
+        with open(os.path.join(here, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_manifest(path, compiler):
+    """Entradas del manifiesto, o {} si no existe, está dañado o es de otro compilador."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('format') != MANIFEST_FORMAT or manifest.get('compiler') != compiler:
+        return {}
+    return manifest.get('files', {})
+
+
+def save_manifest(path, compiler, entries):
+    """Escribe el manifiesto de forma atómica: archivo temporal + os.replace."""
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'format': MANIFEST_FORMAT, 'compiler': compiler, 'files': entries}, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _output_unchanged(out_path, entry):
+    """La salida sigue siendo la que se generó (por stat y, si difiere, por hash)."""
+    try:
+        st = os.stat(out_path)
+    except OSError:
+        return False
+    if st.st_size == entry['output_size'] and st.st_mtime_ns == entry['output_mtime_ns']:
+        return True
+    if st.st_size != entry['output_size'] or file_hash(out_path) != entry['output_hash']:
+        return False
+    entry['output_mtime_ns'] = st.st_mtime_ns
+    return True
+
+
+def _output_entry(source_hash, out_path, optimized):
+    st = os.stat(out_path)
+    return {'source': source_hash, 'optimized': optimized, 'output': os.path.abspath(out_path),
+            'output_hash': file_hash(out_path), 'output_size': st.st_size, 'output_mtime_ns': st.st_mtime_ns}
+
+
+def incremental_build(paths, output_dir=None, workers=None, optimized=False, manifest_path=None):
+    """Como compile_all, pero solo recompila lo que cambió desde el manifiesto.
+
+    Devuelve (fallidos, recompilados): fallidos son (ruta, error) como en
+    compile_all, incluidos los errores guardados de archivos sin cambios y los
+    fuentes que no se pueden leer. Las entradas de archivos que no forman parte
+    de esta compilación se conservan en el manifiesto.
+    """
+    if manifest_path is None:
+        manifest_path = os.path.join(output_dir if output_dir is not None else '.', MANIFEST_NAME)
+    compiler = compiler_version()
+    previous = load_manifest(manifest_path, compiler)
+    entries = dict(previous)
+    changed = False
+    hashes = {}
+    unreadable = {}
+    keys = []
+    pending = []
+    for job in make_jobs(paths, output_dir, optimized):
+        path, out_path, _ = job
+        key = os.path.abspath(path)
+        keys.append(key)
+        try:
+            source_hash = hashes[key] = file_hash(path)
+        except OSError as e:
+            # Como en compile_all: un fuente que no se puede leer es un archivo con error
+            unreadable[key] = str(e)
+            changed = entries.pop(key, None) is not None or changed
+            continue
+        entry = previous.get(key)
+        if entry is not None and entry['source'] == source_hash and entry['optimized'] == optimized \
+                and entry['output'] == os.path.abspath(out_path):
+            mtime_ns = entry.get('output_mtime_ns')
+            if 'error' in entry or _output_unchanged(out_path, entry):
+                # Si solo se tocó la salida, _output_unchanged actualiza su mtime:
+                # se guarda para no volver a calcular su hash la próxima vez
+                changed = changed or entry.get('output_mtime_ns') != mtime_ns
+                continue
+        pending.append(job)
+
+    changed = changed or bool(pending)
+    try:
+        for path, error in run_jobs(pending, workers):
+            key = os.path.abspath(path)
+            if error is None:
+                entries[key] = _output_entry(hashes[key], output_path(path, output_dir), optimized)
+            else:
+                entries[key] = {'source': hashes[key], 'optimized': optimized,
+                                'output': os.path.abspath(output_path(path, output_dir)), 'error': error}
+    finally:
+        # También si se interrumpe: se guarda lo que ya terminó
+        if changed:
+            save_manifest(manifest_path, compiler, entries)
+    failures = []
+    for path, key in zip(paths, keys):
+        if key in unreadable:
+            failures.append((path, unreadable[key]))
+        elif 'error' in entries[key]:
+            failures.append((path, entries[key]['error']))
+    return failures, len(pending)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description='Genera código de 3 direcciones para varios archivos fuente.')
+    arg_parser.add_argument('inputs', nargs='+', help='archivos fuente o patrones glob (p. ej. "src/**/*.txt")')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help='número de procesos (por defecto, uno por núcleo)')
+    arg_parser.add_argument('-o', '--output-dir', default=None,
+                            help=f'carpeta de salida (por defecto, junto a cada fuente, con sufijo {OUTPUT_SUFFIX})')
+    arg_parser.add_argument('-O', '--optimize', action='store_true',
+                            help='aplica las pasadas de optimizer.py antes de escribir')
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='solo recompila los archivos que cambiaron desde la última vez')
+    arg_parser.add_argument('--manifest', default=None,
+                            help=f'manifiesto de --incremental (por defecto, {MANIFEST_NAME} en la carpeta de salida)')
+    args = arg_parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        arg_parser.error('--jobs debe ser al menos 1')
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        arg_parser.error('ningún archivo coincide con las entradas indicadas')
+    try:
+        if args.incremental:
+            failures, rebuilt = incremental_build(paths, args.output_dir, args.jobs, args.optimize, args.manifest)
+        else:
+            failures = compile_all(paths, args.output_dir, args.jobs, args.optimize)
+    except ValueError as e:
+        arg_parser.error(str(e))
+
+    for path, error in failures:
+        print(f'{path}: {error}', file=sys.stderr)
+    print(f'{len(paths) - len(failures)} de {len(paths)} archivos compilados, {len(failures)} con errores')
+    if args.incremental:
+        print(f'{rebuilt} recompilados, {len(paths) - rebuilt} sin cambios')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Compara Parser.expr (pila explícita) con la versión recursiva anterior.
+
+Mide programas normales (bench_lexer.generate_source), una expresión plana
+muy larga y expresiones con paréntesis anidados a distintas profundidades,
+comprobando que ambos generan el mismo código. La versión recursiva falla
+con RecursionError a partir de unos cientos de niveles.
+
+Uso: python bench_expr.py [profundidad_maxima]
+"""
+import sys
+import time
+
+from main import DIVIDE, ID, INTEGER, LPAREN, MINUS, PLUS, RPAREN, TIMES, Parser, TableLexer
+
+
+class RecursiveParser(Parser):
+    """Versión anterior: expr -> term -> factor -> expr, un marco de Python por nivel."""
+
+    def expr(self):
+        left = self.term()
+        while self.current_token.type in (PLUS, MINUS):
+            op = self.current_token.value
+            self.eat(self.current_token.type)
+            right = self.term()
+            temp = self.new_temp()
+            self.emit(op, left, right, temp)
+            left = temp
+        return left
+
+    def term(self):
+        left = self.factor()
+        while self.current_token.type in (TIMES, DIVIDE):
+            op = self.current_token.value
+            self.eat(self.current_token.type)
+            right = self.factor()
+            temp = self.new_temp()
+            self.emit(op, left, right, temp)
+            left = temp
+        return left
+
+    def factor(self):
+        if self.current_token.type == LPAREN:
+            self.eat(LPAREN)
+            place = self.expr()
+            self.eat(RPAREN)
+            return place
+        elif self.current_token.type in (INTEGER, ID):
+            return self.operand()
+        else:
+            self.error("Se esperaba '(', número o identificador")
+
+
+def nested_source(depth):
+    """'var x = ((...(x + 1) * 2...) - 3);' con depth niveles de paréntesis."""
+    ops = ('+ 1', '* 2', '- 3', '/ 4')
+    closing = ' '.join(f'{ops[i % 4]})' for i in range(depth))
+    return f'var x = 1; x = {"(" * depth}x {closing};'
+
+
+def run(parser_class, source):
+    start = time.perf_counter()
+    try:
+        parser = parser_class(TableLexer(source))
+        parser.program()
+        result = parser.code
+    except RecursionError:
+        result = None
+    return result, time.perf_counter() - start
+
+
+def compare(label, source):
+    iterative, t_iter = run(Parser, source)
+    recursive, t_rec = run(RecursiveParser, source)
+    if recursive is None:
+        rec_text = '  RecursionError'
+    else:
+        if recursive != iterative:
+            raise SystemExit(f'Error: código distinto en {label}')
+        rec_text = f'{t_rec:10.3f} s'
+    print(f'{label:<28} pila: {t_iter:8.3f} s   recursiva: {rec_text}')
+
+
+def main():
+    from bench_lexer import generate_source
+
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    compare('programa (50000 sentencias)', generate_source(50000))
+    compare('suma plana (200000 términos)', 'var x = 1; x = ' + ' + '.join(['x'] * 200000) + ';')
+    depth = 10
+    while depth <= max_depth:
+        compare(f'anidamiento {depth}', nested_source(depth))
+        depth *= 10
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Mide batch.py --incremental sobre un árbol de fuentes generado.
+
+Crea archivos pequeños en una carpeta temporal y cronometra la compilación
+completa, una recompilación sin cambios, y otra tras modificar un archivo.
+Como referencia mide también solo hacer stat y hash SHA-256 de todas las
+fuentes, que es el mínimo que necesita una recompilación sin cambios.
+
+Uso: python bench_incremental.py [archivos] [-j N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from batch import expand_inputs, file_hash, incremental_build
+from bench_lexer import generate_source
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Mide las recompilaciones incrementales.')
+    arg_parser.add_argument('files', nargs='?', type=int, default=10000)
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        source_dir = os.path.join(folder, 'fuentes')
+        out_dir = os.path.join(folder, 'salida')
+        for i in range(args.files):
+            # 100 archivos por carpeta, como un árbol de proyecto
+            directory = os.path.join(source_dir, f'd{i // 100}')
+            if i % 100 == 0:
+                os.makedirs(directory)
+            with open(os.path.join(directory, f'f{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write(generate_source(3, seed=i))
+        pattern = os.path.join(source_dir, '**', '*.txt')
+
+        def build():
+            # Cada archivo tiene nombre distinto: todas las salidas caben en una carpeta
+            return incremental_build(expand_inputs([pattern]), out_dir, args.jobs)
+
+        def stat_and_hash():
+            for path in expand_inputs([pattern]):
+                os.stat(path)
+                file_hash(path)
+
+        (_, rebuilt), full = timed(build)
+        print(f'{args.files} archivos')
+        print(f'compilación completa       {full:8.2f} s  ({rebuilt} recompilados)')
+        (_, rebuilt), noop = timed(build)
+        print(f'sin cambios                {noop:8.2f} s  ({rebuilt} recompilados)')
+        _, baseline = timed(stat_and_hash)
+        print(f'solo stat + hash           {baseline:8.2f} s  (sin cambios / referencia: {noop / baseline:.2f}x)')
+        with open(os.path.join(source_dir, 'd0', 'f0.txt'), 'a', encoding='utf-8') as f:
+            f.write('valor0 = valor1 + 1;\n')
+        (_, rebuilt), one = timed(build)
+        print(f'un archivo modificado      {one:8.2f} s  ({rebuilt} recompilados)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Comparación de tokens por segundo entre Lexer (carácter a carácter) y TableLexer.
+
+Uso: python bench_lexer.py [numero_de_sentencias]
+"""
+import random
+import sys
+import time
+
+from main import EOF, Lexer, TableLexer
+
+
+def generate_source(statements, seed=0):
+    """Genera un programa válido con declaraciones, asignaciones y comentarios."""
+    rng = random.Random(seed)
+    names = [f'valor{i}' for i in range(50)]
+    lines = [f'var {name} = {i};' for i, name in enumerate(names)]
+    for i in range(statements):
+        a, b, c = rng.choice(names), rng.choice(names), rng.choice(names)
+        n = rng.randint(0, 1000)
+        lines.append(f'{a} = ({b} + {n}) * {c} - {b} / 7;')
+        if i % 10 == 0:
+            lines.append('# comentario generado')
+    return '\n'.join(lines) + '\n'
+
+
+def scan(lexer_class, source):
+    lexer = lexer_class(source)
+    tokens = []
+    token = lexer.get_next_token()
+    while token.type != EOF:
+        tokens.append((token.type, token.value))
+        token = lexer.get_next_token()
+    return tokens
+
+
+def measure(lexer_class, source, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = scan(lexer_class, source)
+        best = min(best, time.perf_counter() - start)
+    return tokens, best
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    source = generate_source(statements)
+    print(f'Fuente: {len(source)} caracteres, {statements} sentencias')
+
+    reference, t_char = measure(Lexer, source)
+    tokens, t_table = measure(TableLexer, source)
+    if tokens != reference:
+        raise SystemExit('Error: TableLexer no produce la misma secuencia de tokens que Lexer')
+
+    for name, elapsed in (('Lexer', t_char), ('TableLexer', t_table)):
+        print(f'{name:<12} {elapsed:8.3f} s  {len(tokens) / elapsed:12,.0f} tokens/s')
+    print(f'Aceleración: {t_char / t_table:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
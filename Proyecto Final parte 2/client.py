@@ -0,0 +1,124 @@
+"""Cliente ligero del demonio de compilación (daemon.py).
+
+No importa el compilador: solo abre el socket Unix, envía la petición y
+escribe la respuesta, así que cada invocación cuesta poco más que arrancar
+el intérprete. Las rutas se envían absolutas porque el demonio puede estar
+en otro directorio.
+
+Protocolo: cada mensaje es su longitud (4 bytes, big-endian) seguida de un
+objeto JSON en UTF-8. Peticiones: {"source": texto} o {"path": ruta}, con
+"output" (ruta donde escribir el listado) y "optimize" opcionales, o
+{"command": "ping" | "shutdown"}; el demonio rechaza las peticiones de más de
+64 MiB (daemon.MAX_REQUEST_SIZE). Respuestas: {"ok": true, "instructions": N,
+"tac": listado} ("tac" no va si se indicó "output") o {"ok": false, "error": mensaje}.
+
+Uso: python client.py ARCHIVO|- [-o SALIDA] [-O] [--socket RUTA]
+     python client.py --ping | --shutdown [--socket RUTA]
+"""
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+
+HEADER = struct.Struct('>I')
+DEFAULT_SOCKET = os.path.join(os.environ.get('TMPDIR', '/tmp'), f'tac-daemon-{os.getuid()}.sock')
+
+
+def send_message(out, message):
+    data = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    out.write(HEADER.pack(len(data)) + data)
+    out.flush()
+
+
+def recv_message(stream, max_size=None):
+    """Lee un mensaje de stream; None si la conexión se cerró.
+
+    Con max_size, un mensaje más largo se rechaza sin leer su contenido.
+    """
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise Exception('Conexión cerrada a mitad de un mensaje')
+    length, = HEADER.unpack(header)
+    if max_size is not None and length > max_size:
+        raise Exception(f'Mensaje de {length} bytes; el máximo es {max_size}')
+    data = stream.read(length)
+    if len(data) < length:
+        raise Exception('Conexión cerrada a mitad de un mensaje')
+    return json.loads(data)
+
+
+class DaemonClient:
+    """Conexión con el demonio; se puede reutilizar para varias peticiones."""
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.reader = self.socket.makefile('rb')
+        self.writer = self.socket.makefile('wb')
+
+    def request(self, message):
+        send_message(self.writer, message)
+        response = recv_message(self.reader)
+        if response is None:
+            raise Exception('El demonio cerró la conexión')
+        return response
+
+    def close(self):
+        self.reader.close()
+        self.writer.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compila a través del demonio residente.')
+    arg_parser.add_argument('source', nargs='?', help="archivo fuente, o '-' para leer la entrada estándar")
+    arg_parser.add_argument('-o', '--output', help='archivo de salida (por defecto, la salida estándar)')
+    arg_parser.add_argument('-O', '--optimize', action='store_true', help='aplica optimizer.py')
+    arg_parser.add_argument('--socket', default=DEFAULT_SOCKET, help='ruta del socket del demonio')
+    arg_parser.add_argument('--ping', action='store_true', help='comprueba que el demonio responde')
+    arg_parser.add_argument('--shutdown', action='store_true', help='detiene el demonio')
+    args = arg_parser.parse_args()
+
+    if args.ping or args.shutdown:
+        request = {'command': 'ping' if args.ping else 'shutdown'}
+    elif args.source is None:
+        arg_parser.error('falta el archivo fuente')
+    elif args.source == '-':
+        request = {'source': sys.stdin.read()}
+    else:
+        request = {'path': os.path.abspath(args.source)}
+    if args.output:
+        request['output'] = os.path.abspath(args.output)
+    if args.optimize:
+        request['optimize'] = True
+
+    try:
+        with DaemonClient(args.socket) as client:
+            response = client.request(request)
+    except OSError as e:
+        print(f'Error: no se pudo contactar con el demonio en {args.socket}: {e}', file=sys.stderr)
+        return 2
+    except Exception as e:
+        # El demonio cerró la conexión o respondió algo que no es un mensaje válido
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+    if not response['ok']:
+        print(f"Error: {response['error']}", file=sys.stderr)
+        return 1
+    if 'tac' in response:
+        print(response['tac'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Demonio de compilación residente sobre un socket Unix.
+
+Evita pagar en cada archivo el arranque del intérprete y la importación del
+compilador: el demonio se queda en marcha con un pool de procesos que ya
+tienen main y optimizer importados, y atiende peticiones de client.py (o de
+client.DaemonClient) por un socket Unix. Cada conexión se atiende en su
+propio hilo, que pasa la compilación al pool, así que varios clientes
+compilan a la vez. El protocolo está descrito en client.py.
+
+Uso: python daemon.py [--socket RUTA] [-j N]
+     python daemon.py --bench [archivos]  (latencia por archivo: demonio frente a un proceso nuevo)
+"""
+import argparse
+import os
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from client import DEFAULT_SOCKET, DaemonClient, recv_message, send_message
+from main import format_tac, parse_and_generate
+from optimizer import optimize
+
+# Tamaño máximo de una petición: la longitud la indica el cliente, así que sin
+# límite una cabecera errónea haría reservar o esperar cualquier cantidad
+MAX_REQUEST_SIZE = 64 << 20
+
+
+def compile_request(request):
+    """Atiende una petición de compilación en un proceso del pool."""
+    output = request.get('output')
+    try:
+        if 'source' in request:
+            source = request['source']
+        else:
+            with open(request['path'], 'r', encoding='utf-8') as f:
+                source = f.read()
+        code = parse_and_generate(source)
+        if request.get('optimize'):
+            code, _ = optimize(code)
+        tac = format_tac(code)
+        if output is None:
+            return {'ok': True, 'instructions': len(code), 'tac': tac}
+        with open(output, 'w', encoding='utf-8') as out:
+            out.write(tac)
+        return {'ok': True, 'instructions': len(code)}
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+
+
+class CompileHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Una conexión puede enviar varias peticiones seguidas
+        while True:
+            try:
+                request = recv_message(self.rfile, MAX_REQUEST_SIZE)
+            except Exception as e:
+                # Sin un mensaje completo no se sabe dónde empieza el siguiente:
+                # se responde y se cierra esta conexión (el demonio sigue atendiendo)
+                send_message(self.wfile, {'ok': False, 'error': f'Petición no válida: {e}'})
+                return
+            if request is None:
+                return
+            if not isinstance(request, dict):
+                send_message(self.wfile, {'ok': False, 'error': 'Petición no válida: se esperaba un objeto JSON'})
+                continue
+            command = request.get('command')
+            if command == 'ping':
+                response = {'ok': True}
+            elif command == 'shutdown':
+                send_message(self.wfile, {'ok': True})
+                # shutdown() espera a serve_forever, que corre en otro hilo
+                threading.Thread(target=self.server.shutdown).start()
+                return
+            elif command is not None:
+                response = {'ok': False, 'error': f'Orden desconocida: {command}'}
+            else:
+                response = self.server.compile(request)
+            send_message(self.wfile, response)
+
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, workers=None):
+        _remove_stale_socket(path)
+        super().__init__(path, CompileHandler)
+        os.chmod(path, 0o600)
+        self.workers = workers or os.cpu_count() or 1
+        self.pool_lock = threading.Lock()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Arranca todos los procesos ahora y no en la primera petición
+        list(self.pool.map(compile_request, [{'source': 'var x = 1;'}] * self.workers))
+
+    def compile(self, request):
+        pool = self.pool
+        try:
+            return pool.submit(compile_request, request).result()
+        except BrokenProcessPool:
+            # Un proceso del pool murió (p. ej. sin memoria) y el pool ya no sirve:
+            # se sustituye una sola vez aunque fallen varias peticiones a la vez
+            with self.pool_lock:
+                if self.pool is pool:
+                    pool.shutdown(wait=False)
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            return {'ok': False, 'error': 'Un proceso del compilador terminó inesperadamente; se ha reiniciado el pool'}
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def _remove_stale_socket(path):
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)  # quedó de un demonio que terminó sin limpiar
+    else:
+        raise Exception(f'Ya hay un demonio escuchando en {path}')
+    finally:
+        probe.close()
+
+
+def bench(files):
+    import statistics
+    import subprocess
+    import tempfile
+    import time
+
+    from bench_lexer import generate_source
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for i in range(files):
+            path = os.path.join(folder, f'fuente{i}.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_source(50, seed=i))
+            paths.append(path)
+        out_dir = os.path.join(folder, 'salida')
+        os.makedirs(out_dir)
+        socket_path = os.path.join(folder, 'demonio.sock')
+        server = subprocess.Popen([sys.executable, os.path.join(here, 'daemon.py'), '--socket', socket_path])
+        try:
+            deadline = time.perf_counter() + 30
+            while True:
+                try:
+                    with DaemonClient(socket_path) as client:
+                        client.request({'command': 'ping'})
+                    break
+                except OSError:
+                    if time.perf_counter() > deadline:
+                        raise SystemExit('Error: el demonio no arrancó')
+                    time.sleep(0.05)
+
+            def per_file(command):
+                times = []
+                for path in paths:
+                    start = time.perf_counter()
+                    subprocess.run(command(path), check=True, stdout=subprocess.DEVNULL)
+                    times.append(time.perf_counter() - start)
+                return statistics.median(times)
+
+            fresh = per_file(lambda path: [sys.executable, os.path.join(here, 'batch.py'), path,
+                                           '-o', out_dir, '-j', '1'])
+            thin = per_file(lambda path: [sys.executable, os.path.join(here, 'client.py'), path,
+                                          '-o', os.path.join(out_dir, 'x.txt'), '--socket', socket_path])
+            times = []
+            with DaemonClient(socket_path) as client:
+                for path in paths:
+                    start = time.perf_counter()
+                    response = client.request({'path': path, 'output': os.path.join(out_dir, 'y.txt')})
+                    times.append(time.perf_counter() - start)
+                    if not response['ok']:
+                        raise SystemExit(f"Error: {response['error']}")
+            connected = statistics.median(times)
+            with DaemonClient(socket_path) as client:
+                client.request({'command': 'shutdown'})
+        finally:
+            server.wait(timeout=30)
+
+    print(f'{files} archivos de 50 sentencias, mediana por archivo:')
+    print(f'proceso nuevo (batch.py)      {fresh * 1000:8.1f} ms')
+    print(f'client.py + demonio           {thin * 1000:8.1f} ms  ({fresh / thin:.1f}x)')
+    print(f'conexión abierta al demonio   {connected * 1000:8.2f} ms  ({fresh / connected:.0f}x)')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Demonio de compilación residente.')
+    arg_parser.add_argument('--socket', default=DEFAULT_SOCKET, help='ruta del socket Unix')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None, help='procesos del pool (por defecto, uno por núcleo)')
+    arg_parser.add_argument('--bench', nargs='?', type=int, const=50, metavar='ARCHIVOS',
+                            help='mide la latencia por archivo frente a un proceso nuevo')
+    args = arg_parser.parse_args()
+    if args.bench:
+        bench(args.bench)
+        return 0
+    try:
+        server = CompileServer(args.socket, args.jobs)
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    with server:
+        server.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
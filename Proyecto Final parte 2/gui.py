@@ -0,0 +1,239 @@
+"""Interfaz gráfica (Tkinter) de main.py: ventana "Generador de Código de 3 Direcciones".
+
+Se carga solo al ejecutar python main.py o python gui.py; main.py se
+puede importar sin tkinter ni pantalla.
+
+El análisis y el guardado corren en segundo plano (worker.BackgroundJob) con
+barra de progreso y botón Cancelar, así que la ventana sigue respondiendo con
+programas de millones de instrucciones. El resultado se muestra en un
+ListingView, que solo formatea y dibuja las líneas visibles.
+"""
+import os
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import filedialog, messagebox, ttk
+
+from main import TacWriter, format_quad
+from tacbin import BinaryTacWriter
+from worker import BackgroundJob
+
+SAVE_BLOCK = 10000
+WHEEL_LINES = 3
+
+
+class ListingView(tk.Frame):
+    """Listado de solo lectura de count líneas; line_at(i) da la línea i.
+
+    El Text solo contiene las líneas que caben en pantalla: al desplazarse se
+    sustituyen por las de la nueva posición, y la barra de desplazamiento se
+    calcula con el número total de líneas.
+    """
+
+    def __init__(self, master, width=60, height=15):
+        super().__init__(master)
+        self.text = tk.Text(self, width=width, height=height, wrap='none', state='disabled')
+        self.scrollbar = tk.Scrollbar(self, command=self._on_scroll)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.count = 0
+        self.line_at = None
+        self.top = 0
+        self.rows = height
+        self.linespace = tkfont.Font(font=self.text['font']).metrics('linespace')
+        self.text.bind('<Configure>', self._on_resize)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.text.bind(sequence, self._on_wheel)
+        self.text.bind('<Prior>', lambda event: self._scroll_by(-self.rows))
+        self.text.bind('<Next>', lambda event: self._scroll_by(self.rows))
+        self.text.bind('<Up>', lambda event: self._scroll_by(-1))
+        self.text.bind('<Down>', lambda event: self._scroll_by(1))
+
+    def show(self, count, line_at):
+        self.count = count
+        self.line_at = line_at
+        self.top = 0
+        self._render()
+
+    def show_text(self, message):
+        lines = message.split('\n')
+        self.show(len(lines), lines.__getitem__)
+
+    def _render(self):
+        end = min(self.count, self.top + self.rows)
+        content = '\n'.join(self.line_at(i) for i in range(self.top, end))
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', content)
+        self.text.config(state='disabled')
+        if self.count:
+            self.scrollbar.set(self.top / self.count, end / self.count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, self.count - self.rows))
+        if top != self.top:
+            self.top = top
+            self._render()
+        return 'break'
+
+    def _scroll_by(self, lines):
+        return self._scroll_to(self.top + lines)
+
+    def _on_scroll(self, action, value, unit=None):
+        if action == 'moveto':
+            self._scroll_to(int(float(value) * self.count))
+        elif action == 'scroll':
+            step = self.rows if unit == 'pages' else 1
+            self._scroll_by(int(value) * step)
+
+    def _on_wheel(self, event):
+        up = event.num == 4 or getattr(event, 'delta', 0) > 0
+        return self._scroll_by(-WHEEL_LINES if up else WHEEL_LINES)
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self.linespace)
+        if rows != self.rows:
+            self.rows = rows
+            self.top = max(0, min(self.top, self.count - rows))
+            self._render()
+
+# Abrir archivo
+
+def open_file():
+    filepath = filedialog.askopenfilename(
+        title="Selecciona el archivo fuente",
+        filetypes=[("Archivos C/C++", "*.cpp;*.h;*.c"), ("Todos los archivos", "*.*")]
+    )
+    if filepath:
+        with open(filepath, "r", encoding="utf-8") as f:
+            text = f.read()
+        text_area.delete("1.0", tk.END)
+        text_area.insert(tk.END, text)
+
+# Análisis incremental: solo se re-analizan las sentencias afectadas por la edición.
+# Solo lo usa el hilo del trabajo en curso; un update cancelado lo descarta.
+analyzer = None
+job = None
+
+def analyze(source, report):
+    global analyzer
+    from incremental import IncrementalAnalyzer
+    if analyzer is None:
+        analyzer = IncrementalAnalyzer()
+    analyzer.progress = report
+    try:
+        try:
+            analyzer.update(source)
+        except BaseException:
+            analyzer = None
+            raise
+        return analyzer.code()
+    finally:
+        if analyzer is not None:
+            analyzer.progress = None
+
+def save(code, path, report):
+    # .tacb: formato binario de tacbin.py; cualquier otra extensión, el listado de texto
+    binary = path.endswith('.tacb')
+    try:
+        with open(path, 'wb') if binary else open(path, 'w', encoding='utf-8') as out:
+            writer = BinaryTacWriter(out) if binary else TacWriter(out)
+            for start in range(0, len(code), SAVE_BLOCK):
+                report('guardado', start, len(code))
+                writer(code[start:start + SAVE_BLOCK])
+            if binary:
+                writer.close()
+    except BaseException:
+        # Cancelado o con error: no dejar un archivo a medias
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+
+def start_job(work, on_done, message):
+    global job
+    button_analyze.config(state='disabled')
+    button_cancel.config(state='normal')
+    progress.config(value=0)
+    label_status.config(text=message)
+    job = BackgroundJob(root, work, on_done=lambda result: finish_job(on_done, result),
+                        on_error=job_failed, on_progress=show_progress, on_cancel=job_cancelled)
+
+def end_job(message):
+    global job
+    job = None
+    button_analyze.config(state='normal')
+    button_cancel.config(state='disabled')
+    label_status.config(text=message)
+
+def finish_job(on_done, result):
+    end_job('Listo')
+    on_done(result)
+
+def job_failed(error):
+    end_job('Error')
+    messagebox.showerror('Error', str(error))
+
+def job_cancelled():
+    end_job('Cancelado')
+
+def show_progress(phase, done, total):
+    progress.config(maximum=max(total, 1), value=done)
+    label_status.config(text=f'{phase}: {done}/{total}')
+
+def cancel_job():
+    if job is not None:
+        job.cancel()
+
+# Botón de análisis y exportación
+
+def generate_and_save_tac():
+    if job is not None:
+        return
+    source = text_area.get("1.0", tk.END)
+    start_job(lambda report: analyze(source, report), show_and_save, 'Analizando...')
+
+def show_and_save(tac):
+    # Mostrar en la interfaz
+    listing.show(len(tac), lambda i: format_quad(i, tac[i]))
+    label_status.config(text=f'{len(tac)} instrucciones')
+    # Guardar en archivo
+    save_path = filedialog.asksaveasfilename(
+        defaultextension='.txt',
+        filetypes=[('Archivo de texto', '*.txt'), ('Código binario', '*.tacb')],
+        title='Guardar código de 3 direcciones como'
+    )
+    if save_path:
+        start_job(lambda report: save(tac, save_path, report),
+                  lambda result: messagebox.showinfo('Éxito', f'Archivo guardado en:\n{save_path}'),
+                  'Guardando...')
+
+def main():
+    global root, text_area, button_analyze, button_cancel, progress, label_status, listing
+    root = tk.Tk()
+    root.title("Generador de Código de 3 Direcciones")
+    frame = tk.Frame(root, padx=10, pady=10)
+    frame.pack(fill=tk.BOTH, expand=True)
+    button_open = tk.Button(frame, text="Abrir archivo fuente", command=open_file)
+    button_open.pack(pady=5)
+    text_area = tk.Text(frame, width=60, height=15)
+    text_area.pack(pady=5)
+    buttons = tk.Frame(frame)
+    buttons.pack(pady=5)
+    button_analyze = tk.Button(buttons, text="Generar y guardar 3-direcciones", command=generate_and_save_tac)
+    button_analyze.pack(side=tk.LEFT, padx=5)
+    button_cancel = tk.Button(buttons, text="Cancelar", command=cancel_job, state='disabled')
+    button_cancel.pack(side=tk.LEFT, padx=5)
+    progress = ttk.Progressbar(frame, length=400, mode='determinate')
+    progress.pack(pady=5)
+    label_status = tk.Label(frame, text="Resultado:")
+    label_status.pack(pady=5)
+    listing = ListingView(frame, width=60, height=15)
+    listing.pack(fill=tk.BOTH, expand=True, pady=5)
+
+    root.mainloop()
+
+if __name__ == '__main__':
+    main()
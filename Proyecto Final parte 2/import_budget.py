@@ -0,0 +1,78 @@
+"""Presupuesto de tiempo de importación en frío del compilador.
+
+Lanza varios procesos nuevos con python -X importtime -c "import <módulos>",
+toma de cada uno el tiempo acumulado de los módulos pedidos (incluidas sus
+dependencias) y compara la mediana con el presupuesto. También falla si
+alguno arrastra tkinter, que solo debe cargarse desde gui.py.
+
+Uso: python import_budget.py [-n RUNS] [--budget MS] [modulo ...]
+     (por defecto: main; código de salida 1 si se supera el presupuesto)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ('main',)
+DEFAULT_BUDGET_MS = 20.0
+FORBIDDEN = ('tkinter', '_tkinter')
+
+
+def parse_importtime(stderr):
+    """Líneas 'import time: self | acumulado | módulo' -> [(módulo, self_us, acumulado_us, nivel)]."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # El nombre va tras un espacio y se sangra dos espacios por nivel de anidamiento
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return entries
+
+
+def measure(modules, cwd):
+    code = 'import ' + ', '.join(modules)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f'Error al importar {", ".join(modules)}:\n{proc.stderr}')
+    return parse_importtime(proc.stderr)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Mide el tiempo de importación en frío del compilador.')
+    arg_parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES), help='módulos a importar')
+    arg_parser.add_argument('-n', '--runs', type=int, default=15, help='procesos a lanzar (se usa la mediana)')
+    arg_parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS, help='presupuesto en ms')
+    args = arg_parser.parse_args()
+    cwd = os.path.dirname(os.path.abspath(__file__))
+
+    totals = []
+    entries = []
+    for _ in range(args.runs):
+        entries = measure(args.modules, cwd)
+        # Tiempo acumulado de los módulos pedidos (nivel 0: importados por -c)
+        totals.append(sum(cum for name, _, cum, level in entries if name in args.modules and level == 0))
+
+    forbidden = sorted({name for name, _, _, _ in entries if name in FORBIDDEN})
+    median_ms = statistics.median(totals) / 1000
+    print(f'{", ".join(args.modules)}: mediana {median_ms:.2f} ms, mínimo {min(totals) / 1000:.2f} ms '
+          f'({args.runs} procesos, presupuesto {args.budget:.2f} ms)')
+    print('Mayor tiempo propio (última ejecución):')
+    for name, self_us, _, _ in sorted(entries, key=lambda e: -e[1])[:5]:
+        print(f'  {self_us / 1000:7.2f} ms  {name}')
+
+    failed = False
+    if forbidden:
+        print(f'Error: se importó {", ".join(forbidden)}; la interfaz debe cargarse solo desde gui.py')
+        failed = True
+    if median_ms > args.budget:
+        print(f'Error: la importación supera el presupuesto en {median_ms - args.budget:.2f} ms')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
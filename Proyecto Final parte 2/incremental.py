@@ -0,0 +1,408 @@
+"""Re-análisis incremental del buffer del editor.
+
+El programa es una lista plana de sentencias terminadas en ';', así que el
+texto se divide en segmentos que acaban en cada ';' fuera de comentarios
+(el último segmento es lo que queda tras el último ';'). Cada segmento
+guarda sus tokens, las consultas que hizo a la tabla de símbolos (nombre y
+si estaba declarado), la variable que declara y su fragmento de código de 3
+direcciones con temporales locales.
+
+Tras una edición solo se vuelven a dividir y analizar los segmentos que
+tocan el texto cambiado (hasta el final de la línea editada). Los segmentos
+posteriores solo se re-analizan si consultaron un nombre cuya declaración
+cambió, reutilizando sus tokens. El resultado es el mismo que el de
+parse_and_generate sobre el texto completo: el mismo código o el mismo primer
+error.
+
+progress, si se asigna, se llama como progress(fase, hechos, total) cada
+PROGRESS_EVERY segmentos ('división', 'análisis' y 'código'); puede lanzar
+una excepción para cancelar. Un update cancelado deja el analizador a medias
+y hay que descartarlo; code() no modifica el estado.
+
+python incremental.py aplica ediciones aleatorias y comprueba que code() da
+lo mismo que parse_and_generate.
+
+Uso: python incremental.py [ediciones] [--seed N]
+"""
+import argparse
+import heapq
+import random
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from main import EOF, ID, Parser, TableLexer, Temp, parse_and_generate
+
+BOUNDARY_PATTERN = re.compile(r'[;#]')
+NOT_DECLARED = float('inf')
+PROGRESS_EVERY = 1024
+EDIT_PIECES = ('var ', 'int ', 'float ', 'x', 'y', 'total', ' = ', '1', '23', '+', '-', '*', '/',
+               '(', ')', ';', '\n', '# nota\n', '#', ' ', '$', 'var x = 1;\n', 'y = x * 2;\n')
+MAX_CHECK_LENGTH = 300
+
+
+def split_statements(text, start=0, end=None):
+    """Posiciones (exclusivas) de cada ';' fuera de comentarios en text[start:end]."""
+    end = len(text) if end is None else end
+    bounds = []
+    search = BOUNDARY_PATTERN.search
+    pos = start
+    while True:
+        mo = search(text, pos, end)
+        if mo is None:
+            return bounds
+        pos = mo.end()
+        if mo.group() == ';':
+            bounds.append(pos)
+        else:
+            newline = text.find('\n', pos, end)
+            if newline == -1:
+                return bounds
+            pos = newline + 1
+
+
+class _Temp(int):
+    """Temporal local a un segmento; se renumera al ensamblar el programa."""
+
+
+class _LexicalError(Exception):
+    def __init__(self, pos):
+        super().__init__(pos)
+        self.pos = pos
+
+
+class _ReplayLexer:
+    """Devuelve los tokens ya guardados del segmento y, al final, su error léxico."""
+
+    def __init__(self, segment):
+        self._tokens = iter(segment.tokens)
+        self._lex_error = segment.lex_error
+
+    def get_next_token(self):
+        token = next(self._tokens, None)
+        if token is not None:
+            return token
+        raise _LexicalError(self._lex_error)
+
+
+class _SegmentParser(Parser):
+    def new_temp(self):
+        temp = _Temp(self.temp_count)
+        self.temp_count += 1
+        return temp
+
+
+class _SymbolView:
+    """Tabla de símbolos vista desde un segmento: registra cada consulta."""
+
+    def __init__(self, analyzer, segment):
+        self.analyzer = analyzer
+        self.segment = segment
+
+    def __contains__(self, name):
+        declared = self.analyzer.first_declaration(name) < self.segment.index
+        self.segment.uses.append((name, declared))
+        return declared
+
+    def add(self, name):
+        self.segment.declares = name
+
+
+class _Segment:
+    __slots__ = ('index', 'length', 'tokens', 'lex_error', 'uses', 'declares', 'code', 'temps', 'error')
+
+    def __init__(self, text):
+        self.length = len(text)
+        self.tokens = []
+        self.lex_error = None
+        lexer = TableLexer(text)
+        try:
+            token = lexer.get_next_token()
+            while token.type != EOF:
+                self.tokens.append(token)
+                token = lexer.get_next_token()
+            self.tokens.append(token)
+        except Exception:
+            self.lex_error = lexer.pos
+        self.uses = []
+        self.declares = None
+        self.code = []
+        self.temps = 0
+        self.error = None
+
+
+class IncrementalAnalyzer:
+    def __init__(self):
+        self.text = ''
+        self.segments = []
+        self.starts = [0]
+        self.declarers = {}  # nombre -> segmentos (sin error) que lo declaran
+        self.users = {}      # nombre -> segmentos que lo consultaron
+        self.failed = set()  # segmentos con error
+        self.last_reanalyzed = 0
+        self.progress = None
+        self._rebuild('')
+
+    # Consultas sobre la tabla de símbolos global
+    def first_declaration(self, name):
+        segments = self.declarers.get(name)
+        return min(s.index for s in segments) if segments else NOT_DECLARED
+
+    def _valid(self, segment):
+        return all((self.first_declaration(name) < segment.index) == declared
+                   for name, declared in segment.uses)
+
+    def _analyze(self, segment):
+        segment.uses = []
+        segment.declares = None
+        segment.code = []
+        segment.temps = 0
+        segment.error = None
+        try:
+            parser = _SegmentParser(_ReplayLexer(segment))
+            parser.symbols = _SymbolView(self, segment)
+            if parser.current_token.type in (ID, 'VAR'):
+                parser.statement()
+            if parser.current_token.type != EOF:
+                parser.error("Se esperaba fin de archivo")
+            segment.code = parser.code
+            segment.temps = parser.temp_count
+        except _LexicalError as e:
+            segment.error = e
+        except Exception as e:
+            segment.error = str(e)
+        if segment.error is not None:
+            segment.declares = None
+        self._register(segment)
+        self.last_reanalyzed += 1
+        if self.progress is not None and self.last_reanalyzed % PROGRESS_EVERY == 0:
+            self.progress('análisis', self.last_reanalyzed, len(self.segments))
+
+    def _register(self, segment):
+        if segment.declares is not None:
+            self.declarers.setdefault(segment.declares, set()).add(segment)
+        for name, _ in segment.uses:
+            self.users.setdefault(name, set()).add(segment)
+        if segment.error is not None:
+            self.failed.add(segment)
+
+    def _unregister(self, segment):
+        if segment.declares is not None:
+            self.declarers[segment.declares].discard(segment)
+        for name, _ in segment.uses:
+            self.users[name].discard(segment)
+        self.failed.discard(segment)
+
+    def _new_segments(self, text, start, end, is_tail):
+        cuts = split_statements(text, start, end)
+        if not is_tail and (cuts[-1] if cuts else start) != end:
+            return None
+        pieces = [start] + cuts
+        if is_tail:
+            pieces.append(end)
+        if self.progress is None:
+            return [_Segment(text[a:b]) for a, b in zip(pieces, pieces[1:])]
+        segments = []
+        for i, (a, b) in enumerate(zip(pieces, pieces[1:])):
+            if i % PROGRESS_EVERY == 0:
+                self.progress('división', i, len(pieces) - 1)
+            segments.append(_Segment(text[a:b]))
+        return segments
+
+    def _rebuild(self, text):
+        for segment in self.segments:
+            self._unregister(segment)
+        self.text = text
+        self.segments = self._new_segments(text, 0, len(text), True)
+        self.starts = [0, *accumulate(s.length for s in self.segments)]
+        for i, segment in enumerate(self.segments):
+            segment.index = i
+            self._analyze(segment)
+
+    def update(self, text):
+        """Actualiza el análisis para el nuevo contenido del buffer."""
+        self.last_reanalyzed = 0
+        old = self.text
+        if text == old:
+            return
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        delta = len(text) - len(old)
+        segments = self.segments
+
+        first = min(bisect_right(self.starts, prefix) - 1, len(segments) - 1)
+        # Desde el inicio de la línea siguiente al cambio el texto es idéntico
+        # y no hay comentario abierto: el primer segmento que empieza ahí es estable
+        newline = old.find('\n', len(old) - suffix)
+        last = len(segments) if newline == -1 else bisect_left(self.starts, newline + 1, first + 1)
+        is_tail = last >= len(segments)
+        region_start = self.starts[first]
+        region_end = len(text) if is_tail else self.starts[last] + delta
+        new = self._new_segments(text, region_start, region_end, is_tail)
+        if new is None:
+            self._rebuild(text)
+            return
+
+        removed = segments[first:last]
+        # Nombres declarados en la región: importa si estaban declarados antes del
+        # resto del programa (los segmentos posteriores) y si lo siguen estando
+        candidates = {s.declares for s in removed if s.declares is not None}
+        declared_before = {name: self.first_declaration(name) < last for name in candidates}
+        for segment in removed:
+            self._unregister(segment)
+        segments[first:last] = new
+        self.text = text
+        if len(new) != len(removed):
+            for i in range(first, len(segments)):
+                segments[i].index = i
+        else:
+            for i, segment in enumerate(new, first):
+                segment.index = i
+        self.starts = [0, *accumulate(s.length for s in segments)]
+
+        for segment in new:
+            self._analyze(segment)
+            if segment.declares is not None and segment.declares not in declared_before:
+                # Antes de la edición se consulta con los índices viejos
+                declared_before[segment.declares] = self.first_declaration(segment.declares) < first
+                candidates.add(segment.declares)
+        suffix_start = first + len(new)
+        changed = [name for name in candidates
+                   if (self.first_declaration(name) < suffix_start) != declared_before[name]]
+        self._revalidate(changed, suffix_start)
+
+    def _revalidate(self, names, start):
+        """Re-analiza en orden los segmentos desde start que consultaron names."""
+        pending = []
+        queued = set()
+
+        def push_users(name, after):
+            for segment in self.users.get(name, ()):
+                if segment.index >= after and segment not in queued:
+                    queued.add(segment)
+                    heapq.heappush(pending, (segment.index, id(segment), segment))
+
+        for name in names:
+            push_users(name, start)
+        while pending:
+            _, _, segment = heapq.heappop(pending)
+            if self._valid(segment):
+                continue
+            before = segment.declares
+            self._unregister(segment)
+            self._analyze(segment)
+            for name in {before, segment.declares} - {None}:
+                if before != segment.declares:
+                    push_users(name, segment.index + 1)
+
+    def first_error(self):
+        """Mensaje del primer error del programa, o None si es válido."""
+        if not self.failed:
+            return None
+        segment = min(self.failed, key=lambda s: s.index)
+        if isinstance(segment.error, _LexicalError):
+            return f'Error léxico en la posición {self.starts[segment.index] + segment.error.pos}'
+        return segment.error
+
+    def code(self):
+        """Código de 3 direcciones del programa, igual que parse_and_generate."""
+        error = self.first_error()
+        if error is not None:
+            raise Exception(error)
+        code = []
+        offset = 0
+        names = {}
+
+        def rename(operand):
+            if type(operand) is _Temp:
+                n = operand + offset
+                name = names.get(n)
+                if name is None:
+                    name = names[n] = Temp(n)
+                return name
+            return operand
+
+        for i, segment in enumerate(self.segments):
+            if self.progress is not None and i % PROGRESS_EVERY == 0:
+                self.progress('código', i, len(self.segments))
+            for op, a1, a2, res in segment.code:
+                code.append((op, rename(a1), rename(a2), rename(res)))
+            offset += segment.temps
+        return code
+
+
+def _common_prefix(a, b):
+    """Longitud del prefijo común (búsqueda binaria con comparaciones en C)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a, b, limit):
+    lo, hi = 0, limit
+    la, lb = len(a), len(b)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[la - mid:la - lo] == b[lb - mid:lb - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def random_edit(rng, text):
+    """Borra unos caracteres de text e inserta trozos de EDIT_PIECES en su lugar."""
+    start = rng.randint(0, len(text))
+    end = min(len(text), start + rng.randint(0, 6 if len(text) < MAX_CHECK_LENGTH else 60))
+    inserted = ''.join(rng.choice(EDIT_PIECES) for _ in range(rng.randint(0, 3)))
+    return text[:start] + inserted + text[end:]
+
+
+def _outcome(generate):
+    try:
+        return generate()
+    except Exception as e:
+        return f'Error: {e}'
+
+
+def check(updates, seed=0):
+    """Aplica ediciones aleatorias y compara code() con parse_and_generate.
+
+    Devuelve el primer desacuerdo como (texto, incremental, parse_and_generate),
+    o None. Un error cuenta como su mensaje.
+    """
+    rng = random.Random(seed)
+    analyzer = IncrementalAnalyzer()
+    text = ''
+    for _ in range(updates):
+        text = random_edit(rng, text)
+        analyzer.update(text)
+        got = _outcome(analyzer.code)
+        expected = _outcome(lambda: parse_and_generate(text))
+        if got != expected:
+            return text, got, expected
+    return None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Comprueba el análisis incremental contra parse_and_generate.')
+    arg_parser.add_argument('updates', nargs='?', type=int, default=5000, help='número de ediciones')
+    arg_parser.add_argument('--seed', type=int, default=0, help='semilla de las ediciones')
+    args = arg_parser.parse_args()
+    mismatch = check(args.updates, args.seed)
+    if mismatch is not None:
+        text, got, expected = mismatch
+        print(f'Diferencia con el texto {text!r}:\n  incremental:        {got}\n  parse_and_generate: {expected}')
+        return 1
+    print(f'{args.updates} ediciones: mismo resultado que parse_and_generate')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Instrumentación opcional de la compilación por fases.
+
+compile_instrumented hace lo mismo que parse_and_generate (y opcionalmente
+escribe el listado), pero separa las fases para medirlas:
+
+  lex     TableLexer recorre todo el texto y guarda los tokens
+  parse   InstrumentedParser consume esos tokens y genera los cuádruplos
+  tac     el listado se formatea y se escribe
+
+y produce un informe (dict) con el tiempo de cada fase, tokens por tipo,
+llamadas a emit, temporales creados, tamaño de la tabla de símbolos y
+profundidad máxima de paréntesis. El informe se entrega a un sink: cualquier
+función que reciba el dict, o JsonLinesSink para añadirlo como una línea
+JSON a un archivo.
+
+Sin instrumentación no cambia nada: Parser, TableLexer y parse_and_generate
+no tienen ningún gancho; todo está en las subclases y funciones de este
+módulo. Cada fase corre en su propia función (phase_lex, phase_parse,
+phase_tac), así que en cProfile o py-spy aparecen como entradas separadas;
+--profile guarda las estadísticas de cProfile de la compilación.
+
+Uso: python instrument.py archivo_fuente [--jsonl ARCHIVO] [-o SALIDA] [--profile ARCHIVO]
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+from main import EOF, LPAREN, RPAREN, Parser, TableLexer, TacWriter, format_tac
+
+
+class _ReplayLexer:
+    """Entrega los tokens ya escaneados y, al final, el error léxico si lo hubo."""
+
+    def __init__(self, tokens, error):
+        self._tokens = iter(tokens)
+        self._error = error
+
+    def get_next_token(self):
+        token = next(self._tokens, None)
+        if token is not None:
+            return token
+        raise Exception(self._error)
+
+
+class InstrumentedParser(Parser):
+    def __init__(self, lexer, sink=None):
+        self.emit_calls = 0
+        self.depth = 0
+        self.max_depth = 0
+        super().__init__(lexer, sink)
+
+    def emit(self, op, arg1, arg2, res):
+        self.emit_calls += 1
+        self.code.append((op, arg1, arg2, res))
+
+    def eat(self, token_type):
+        super().eat(token_type)
+        if token_type == LPAREN:
+            self.depth += 1
+            if self.depth > self.max_depth:
+                self.max_depth = self.depth
+        elif token_type == RPAREN:
+            self.depth -= 1
+
+
+class JsonLinesSink:
+    """Añade cada informe como una línea JSON a path (o a un archivo abierto)."""
+
+    def __init__(self, target):
+        self.target = target
+
+    def __call__(self, report):
+        line = json.dumps(report, ensure_ascii=False) + '\n'
+        if hasattr(self.target, 'write'):
+            self.target.write(line)
+            self.target.flush()
+        else:
+            with open(self.target, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+def phase_lex(source_code, lexer_class):
+    lexer = lexer_class(source_code)
+    tokens = []
+    error = None
+    try:
+        token = lexer.get_next_token()
+        while token.type != EOF:
+            tokens.append(token)
+            token = lexer.get_next_token()
+        tokens.append(token)
+    except Exception as e:
+        error = str(e)
+    return tokens, error
+
+
+def phase_parse(tokens, error):
+    parser = InstrumentedParser(_ReplayLexer(tokens, error))
+    try:
+        parser.program()
+    except Exception as e:
+        return parser, str(e)
+    return parser, None
+
+
+def phase_tac(code, out):
+    if out is None:
+        return format_tac(code)
+    writer = TacWriter(out)
+    writer(code)
+    return None
+
+
+def compile_instrumented(source_code, sink=None, out=None, lexer_class=TableLexer):
+    """Compila source_code midiendo cada fase. Devuelve (código, informe).
+
+    out: archivo donde escribir el listado (si no, solo se formatea).
+    sink: función que recibe el informe, también cuando hay errores (que se
+    relanzan después con el mismo mensaje que parse_and_generate).
+    """
+    report = {'chars': len(source_code), 'phases': {}}
+    clock = time.perf_counter
+
+    start = clock()
+    tokens, lex_error = phase_lex(source_code, lexer_class)
+    report['phases']['lex'] = clock() - start
+    kinds = Counter(token.type for token in tokens if token.type != EOF)
+    report['tokens'] = sum(kinds.values())
+    report['tokens_by_type'] = dict(kinds.most_common())
+
+    start = clock()
+    parser, error = phase_parse(tokens, lex_error)
+    report['phases']['parse'] = clock() - start
+    report['emit_calls'] = parser.emit_calls
+    report['temps'] = parser.temp_count
+    report['symbols'] = len(parser.symbols)
+    report['max_nesting'] = parser.max_depth
+
+    if error is None:
+        start = clock()
+        phase_tac(parser.code, out)
+        report['phases']['tac'] = clock() - start
+    report['instructions'] = len(parser.code)
+    report['total'] = sum(report['phases'].values())
+    report['error'] = error
+    if sink is not None:
+        sink(report)
+    if error is not None:
+        raise Exception(error)
+    return parser.code, report
+
+
+def format_report(report):
+    lines = [f"{name:<6} {seconds * 1000:10.2f} ms" for name, seconds in report['phases'].items()]
+    lines.append(f"total  {report['total'] * 1000:10.2f} ms")
+    lines.append(f"tokens: {report['tokens']}  "
+                 + ', '.join(f'{kind} {count}' for kind, count in report['tokens_by_type'].items()))
+    lines.append(f"emit: {report['emit_calls']}  temporales: {report['temps']}  "
+                 f"símbolos: {report['symbols']}  anidamiento máximo: {report['max_nesting']}")
+    if report['error']:
+        lines.append(f"error: {report['error']}")
+    return '\n'.join(lines)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compila midiendo cada fase.')
+    arg_parser.add_argument('source', help='archivo fuente')
+    arg_parser.add_argument('--jsonl', help='añade el informe como línea JSON a este archivo')
+    arg_parser.add_argument('-o', '--output', help='escribe el listado de 3 direcciones en este archivo')
+    arg_parser.add_argument('--profile', help='guarda las estadísticas de cProfile en este archivo')
+    args = arg_parser.parse_args()
+    with open(args.source, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    reports = []
+    sinks = [reports.append]
+    if args.jsonl:
+        sinks.append(JsonLinesSink(args.jsonl))
+
+    def sink(report):
+        for each in sinks:
+            each(report)
+
+    def run():
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                compile_instrumented(source, sink, out)
+        else:
+            compile_instrumented(source, sink)
+
+    status = 0
+    try:
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                profiler.runcall(run)
+            finally:
+                profiler.dump_stats(args.profile)
+        else:
+            run()
+    except Exception as e:
+        if not reports:
+            # Falló antes de compilar (p. ej. no se pudo abrir -o): no hay informe
+            print(f'Error: {e}', file=sys.stderr)
+            return 1
+        status = 1
+    print(format_report(reports[0]))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox
+import codecs
+import re
 
 # Definición de los tipos de tokens
 INTEGER, ID, PLUS, MINUS, TIMES, DIVIDE, LPAREN, RPAREN, ASSIGN, SEMICOLON, EOF = (
@@ -86,16 +86,182 @@ class Lexer:
             self.error()
         return Token(EOF, None)
 
+# Escáner con patrón maestro: una única expresión regular precompilada separa
+# comentarios '#', identificadores, enteros y cualquier otro carácter no blanco;
+# los espacios se saltan dentro del motor de re. El texto se recorre en bloques
+# cortados tras un salto de línea (ningún token ni comentario cruza una línea),
+# de modo que los errores léxicos se siguen detectando de forma perezosa, igual
+# que en Lexer, y produce exactamente los mismos Token.
+SINGLE_CHAR_TOKENS = {
+    '+': PLUS, '-': MINUS, '*': TIMES, '/': DIVIDE,
+    '(': LPAREN, ')': RPAREN, '=': ASSIGN, ';': SEMICOLON,
+}
+
+MASTER_PATTERN = re.compile(r'#[^\n]*|[^\W\d_]\w*|\d+|\S')
+CHUNK_SIZE = 1 << 16
+
+class TableLexer:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self._tokens = self._scan()
+
+    def error(self):
+        raise Exception(f'Error léxico en la posición {self.pos}')
+
+    def _scan(self):
+        text = self.text
+        findall = MASTER_PATTERN.findall
+        single = SINGLE_CHAR_TOKENS.get
+        keyword = RESERVED_KEYWORDS.get
+        length = len(text)
+        start = 0
+        while start < length:
+            end = text.find('\n', start + CHUNK_SIZE)
+            end = length if end == -1 else end + 1
+            for lexeme in findall(text, start, end):
+                kind = single(lexeme)
+                if kind is not None:
+                    yield Token(kind, lexeme)
+                    continue
+                first = lexeme[0]
+                if first.isalpha():
+                    yield Token(keyword(lexeme, ID), lexeme)
+                elif first.isdigit():
+                    yield Token(INTEGER, int(lexeme))
+                elif first != '#':
+                    self._locate_error(start, end)
+            start = end
+        self.pos = length
+
+    def _locate_error(self, start, end):
+        # Solo en el camino de error: busca el primer carácter inválido del bloque
+        for mo in MASTER_PATTERN.finditer(self.text, start, end):
+            lexeme = mo.group()
+            if lexeme not in SINGLE_CHAR_TOKENS and lexeme[0] != '#' \
+                    and not lexeme[0].isalpha() and not lexeme[0].isdigit():
+                self.pos = mo.start()
+                break
+        self.error()
+
+    def get_next_token(self):
+        token = next(self._tokens, None)
+        return token if token is not None else Token(EOF, None)
+
+# Escáner por bloques sobre una fuente binaria con read(n): open(ruta, 'rb'),
+# sys.stdin.buffer, un mmap... Lee chunk_size bytes cada vez y los decodifica de
+# forma incremental (un carácter UTF-8 puede quedar partido entre bloques), así
+# que la memoria no depende del tamaño de la entrada. Si el último lexema del
+# bloque llega justo al final puede continuar en el siguiente: se guarda y se
+# vuelve a escanear con él; un comentario abierto se salta hasta el '\n'. Produce
+# los mismos Token y los mismos errores (con la posición en caracteres) que
+# TableLexer sobre el texto completo.
+class StreamLexer(TableLexer):
+    def __init__(self, source, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.pos = 0
+        self._tokens = self._scan()
+
+    def _scan(self):
+        read = self.source.read
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        findall = MASTER_PATTERN.findall
+        single = SINGLE_CHAR_TOKENS.get
+        keyword = RESERVED_KEYWORDS.get
+        carry = ''
+        base = 0  # posición en caracteres del inicio de text
+        in_comment = False
+        final = False
+        while not final:
+            data = read(self.chunk_size)
+            final = not data
+            text = carry + decoder.decode(data, final)
+            carry = ''
+            if in_comment:
+                newline = text.find('\n')
+                if newline == -1:
+                    base += len(text)
+                    continue
+                in_comment = False
+                base += newline
+                text = text[newline:]
+            lexemes = findall(text)
+            if lexemes and not final:
+                last = lexemes[-1]
+                if text.endswith(last) and last not in SINGLE_CHAR_TOKENS:
+                    lexemes.pop()
+                    if last[0] == '#':
+                        in_comment = True
+                    else:
+                        carry = last
+            for lexeme in lexemes:
+                kind = single(lexeme)
+                if kind is not None:
+                    yield Token(kind, lexeme)
+                    continue
+                first = lexeme[0]
+                if first.isalpha():
+                    yield Token(keyword(lexeme, ID), lexeme)
+                elif first.isdigit():
+                    yield Token(INTEGER, int(lexeme))
+                elif first != '#':
+                    self._locate_error_in(text, base)
+            base += len(text) - len(carry)
+        self.pos = base
+
+    def _locate_error_in(self, text, base):
+        for mo in MASTER_PATTERN.finditer(text):
+            lexeme = mo.group()
+            if lexeme not in SINGLE_CHAR_TOKENS and lexeme[0] != '#' \
+                    and not lexeme[0].isalpha() and not lexeme[0].isdigit():
+                self.pos = base + mo.start()
+                break
+        self.error()
+
+# Temporal tN creado por Parser.new_temp: un entero con su número, de otro tipo
+# que las variables (str) y las constantes (int). Nunca es igual a una variable
+# llamada 'tN' ni a la constante N (tampoco como clave de un dict, aunque comparta
+# el hash de N); al formatearlo se escribe tN. Ocupa menos que la cadena 'tN';
+# para json y la aritmética sigue siendo el entero N
+class Temp(int):
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(other) is Temp and int.__eq__(self, other)
+
+    def __ne__(self, other):
+        return type(other) is not Temp or int.__ne__(self, other)
+
+    __hash__ = int.__hash__
+
+    def __str__(self):
+        return f't{int(self)}'
+
+    def __format__(self, spec):
+        return format(f't{int(self)}', spec)
+
+    def __repr__(self):
+        return f'Temp({int(self)})'
+
+# Número N si value es el temporal tN, None si es una variable o una constante
+def temp_number(value):
+    return int(value) if type(value) is Temp else None
+
 class Parser:
-    def __init__(self, lexer):
+    # sink: si se indica, recibe la lista de cuádruplos de cada sentencia en cuanto
+    # ésta termina y self.code se vacía después, así la memoria no crece con el programa
+    def __init__(self, lexer, sink=None):
         self.lexer = lexer
         self.current_token = lexer.get_next_token()
         self.symbols = set()
         self.temp_count = 0
         self.code = []
+        self.sink = sink
 
     def new_temp(self):
-        name = f't{self.temp_count}'
+        name = Temp(self.temp_count)
         self.temp_count += 1
         return name
 
@@ -119,6 +285,9 @@ class Parser:
     def statement_list(self):
         while self.current_token.type in (ID, 'VAR'):
             self.statement()
+            if self.sink is not None:
+                self.sink(self.code)
+                self.code.clear()
 
     def statement(self):
         if self.current_token.type == 'VAR':
@@ -141,35 +310,50 @@ class Parser:
             self.emit('=', place, None, var_name)
             self.eat(SEMICOLON)
 
+    # Expr → Term {(+|-) Term},  Term → Factor {(*|/) Factor},  Factor → ( Expr ) | INTEGER | ID
+    # Se analiza con una pila explícita en lugar de recursión, así que la profundidad
+    # de paréntesis solo está limitada por la memoria. Cada nivel de paréntesis es un
+    # marco [izquierda de Expr, op de Expr, izquierda de Term, op de Term] con la
+    # operación pendiente de cada nivel de precedencia; los cuádruplos se emiten en
+    # el mismo orden que con la gramática recursiva.
     def expr(self):
-        left = self.term()
-        while self.current_token.type in (PLUS, MINUS):
-            op = self.current_token.value
-            self.eat(self.current_token.type)
-            right = self.term()
-            temp = self.new_temp()
-            self.emit(op, left, right, temp)
-            left = temp
-        return left
-
-    def term(self):
-        left = self.factor()
-        while self.current_token.type in (TIMES, DIVIDE):
-            op = self.current_token.value
-            self.eat(self.current_token.type)
-            right = self.factor()
-            temp = self.new_temp()
-            self.emit(op, left, right, temp)
-            left = temp
-        return left
-
-    def factor(self):
-        if self.current_token.type == LPAREN:
-            self.eat(LPAREN)
-            place = self.expr()
-            self.eat(RPAREN)
-            return place
-        elif self.current_token.type == INTEGER:
+        frames = [[None, None, None, None]]
+        while True:
+            while self.current_token.type == LPAREN:
+                self.eat(LPAREN)
+                frames.append([None, None, None, None])
+            place = self.operand()
+            # Factor completo: se cierran las operaciones pendientes hasta que
+            # aparece un operador (que abre otra) o termina la Expr del marco
+            while True:
+                frame = frames[-1]
+                if frame[3] is not None:
+                    temp = self.new_temp()
+                    self.emit(frame[3], frame[2], place, temp)
+                    place = temp
+                    frame[3] = None
+                token = self.current_token
+                if token.type in (TIMES, DIVIDE):
+                    frame[2], frame[3] = place, token.value
+                    self.eat(token.type)
+                    break
+                if frame[1] is not None:
+                    temp = self.new_temp()
+                    self.emit(frame[1], frame[0], place, temp)
+                    place = temp
+                    frame[1] = None
+                if token.type in (PLUS, MINUS):
+                    frame[0], frame[1] = place, token.value
+                    self.eat(token.type)
+                    break
+                frames.pop()
+                if not frames:
+                    return place
+                # La Expr entre paréntesis es un Factor del marco anterior
+                self.eat(RPAREN)
+
+    def operand(self):
+        if self.current_token.type == INTEGER:
             value = self.current_token.value
             temp = self.new_temp()
             self.emit('=', value, None, temp)
@@ -178,7 +362,7 @@ class Parser:
         elif self.current_token.type == ID:
             name = self.current_token.value
             if name not in self.symbols:
-                raise Exception(f"Variable '{name}' no declarada en token {self.current_token}")
+                self.error(f"Variable '{name}' no declarada")
             self.eat(ID)
             return name
         else:
@@ -186,63 +370,41 @@ class Parser:
 
 # Generación de TAC
 
-def parse_and_generate(source_code):
-    lexer = Lexer(source_code)
+def parse_and_generate(source_code, lexer_class=TableLexer):
+    lexer = lexer_class(source_code)
     parser = Parser(lexer)
     parser.program()
     return parser.code
 
-# GUI
-root = tk.Tk()
-root.title("Generador de Código de 3 Direcciones")
-frame = tk.Frame(root, padx=10, pady=10)
-frame.pack()
-
-# Abrir archivo
-
-def open_file():
-    filepath = filedialog.askopenfilename(
-        title="Selecciona el archivo fuente",
-        filetypes=[("Archivos C/C++", "*.cpp;*.h;*.c"), ("Todos los archivos", "*.*")]
-    )
-    if filepath:
-        with open(filepath, "r", encoding="utf-8") as f:
-            text = f.read()
-        text_area.delete("1.0", tk.END)
-        text_area.insert(tk.END, text)
-
-button_open = tk.Button(frame, text="Abrir archivo fuente", command=open_file)
-button_open.pack(pady=5)
-text_area = tk.Text(frame, width=60, height=15)
-text_area.pack(pady=5)
-
-# Botón de análisis y exportación
-
-def generate_and_save_tac():
-    source = text_area.get("1.0", tk.END)
-    try:
-        tac = parse_and_generate(source)
-        lines = [f"{i}: {res} = {a1} {op} {a2}" if a2 is not None else f"{i}: {res} = {a1}"
-                 for i, (op, a1, a2, res) in enumerate(tac)]
-        content = "\n".join(lines)
-        # Mostrar en la interfaz
-        label_result.config(text=content)
-        # Guardar en archivo
-        save_path = filedialog.asksaveasfilename(
-            defaultextension='.txt',
-            filetypes=[('Archivo de texto', '*.txt')],
-            title='Guardar código de 3 direcciones como'
-        )
-        if save_path:
-            with open(save_path, 'w', encoding='utf-8') as out:
-                out.write(content)
-            messagebox.showinfo('Éxito', f'Archivo guardado en:\n{save_path}')
-    except Exception as e:
-        messagebox.showerror('Error', str(e))
-
-button_analyze = tk.Button(frame, text="Generar y guardar 3-direcciones", command=generate_and_save_tac)
-button_analyze.pack(pady=5)
-label_result = tk.Label(frame, text="Resultado:")
-label_result.pack(pady=5)
-
-root.mainloop()
\ No newline at end of file
+def format_quad(i, quad):
+    op, a1, a2, res = quad
+    return f"{i}: {res} = {a1} {op} {a2}" if a2 is not None else f"{i}: {res} = {a1}"
+
+def format_tac(tac):
+    return "\n".join(format_quad(i, quad) for i, quad in enumerate(tac))
+
+# Emisión en streaming: escribe cada sentencia al terminarla, con el mismo
+# formato (byte a byte) que format_tac
+class TacWriter:
+    def __init__(self, out):
+        self.out = out
+        self.count = 0
+
+    def __call__(self, quads):
+        if not quads:
+            return
+        start = self.count
+        text = "\n".join(format_quad(i, quad) for i, quad in enumerate(quads, start))
+        self.out.write("\n" + text if start else text)
+        self.count += len(quads)
+
+def stream_tac(source_code, out, lexer_class=TableLexer):
+    writer = TacWriter(out)
+    parser = Parser(lexer_class(source_code), sink=writer)
+    parser.program()
+    return writer.count
+
+# La interfaz gráfica está en gui.py y solo se carga al ejecutar el script
+if __name__ == '__main__':
+    import gui
+    gui.main()
@@ -0,0 +1,223 @@
+"""Optimizador del código de 3 direcciones generado por Parser.
+
+El programa es una lista plana de sentencias sin saltos, es decir, un único
+bloque básico, así que cada pasada recorre los cuádruplos una vez:
+
+  constantes  plegado y propagación de constantes
+  copias      propagación de copias (x = y)
+  cse         eliminación de subexpresiones comunes por numeración de valores
+  muertas     eliminación de asignaciones cuyo resultado nunca se usa
+  fusion      't = a op b; x = t' pasa a 'x = a op b' si t no se usa más
+
+Las variables del programa se consideran vivas al final (su valor final es el
+resultado); los temporales no. Las divisiones que pueden fallar en ejecución
+(divisor no constante o cero) nunca se pliegan ni se eliminan.
+
+Uso: python optimizer.py archivo_fuente  (imprime el listado optimizado y las estadísticas)
+"""
+import sys
+
+from main import Temp, format_tac, parse_and_generate, temp_number
+
+COMMUTATIVE = ('+', '*')
+NAMES = (str, Temp)  # variables y temporales; las constantes son int
+
+
+def fold(op, a, b):
+    """Valor constante de 'a op b', o None si no se puede plegar con seguridad."""
+    if op == '+':
+        return a + b
+    if op == '-':
+        return a - b
+    if op == '*':
+        return a * b
+    # Solo divisiones exactas: el resultado no depende de cómo se redondee
+    if op == '/' and b != 0 and a % b == 0:
+        return a // b
+    return None
+
+
+def may_fail(quad):
+    op, _, arg2, _ = quad
+    return op == '/' and (type(arg2) is not int or arg2 == 0)
+
+
+def constant_propagation(code):
+    consts = {}
+    out = []
+    for op, a1, a2, res in code:
+        a1 = consts.get(a1, a1) if isinstance(a1, NAMES) else a1
+        a2 = consts.get(a2, a2) if isinstance(a2, NAMES) else a2
+        if a2 is None:
+            value = a1 if type(a1) is int else None
+        elif type(a1) is int and type(a2) is int:
+            value = fold(op, a1, a2)
+        else:
+            value = None
+        if value is not None:
+            consts[res] = value
+            out.append(('=', value, None, res))
+        else:
+            consts.pop(res, None)
+            out.append((op, a1, a2, res))
+    return out
+
+
+def copy_propagation(code):
+    copies = {}    # nombre -> nombre del que es copia
+    copied_by = {}  # nombre -> nombres que lo copian (para invalidar)
+    out = []
+    for op, a1, a2, res in code:
+        a1 = copies.get(a1, a1) if isinstance(a1, NAMES) else a1
+        a2 = copies.get(a2, a2) if isinstance(a2, NAMES) else a2
+        # res cambia: deja de ser copia de algo y sus copias dejan de ser válidas
+        source = copies.pop(res, None)
+        if source is not None:
+            copied_by[source].discard(res)
+        for name in copied_by.pop(res, ()):
+            del copies[name]
+        if a2 is None and isinstance(a1, NAMES) and a1 != res:
+            copies[res] = a1
+            copied_by.setdefault(a1, set()).add(res)
+        out.append((op, a1, a2, res))
+    return out
+
+
+def common_subexpressions(code):
+    # Numeración local de valores: cada nombre apunta al número del valor que
+    # contiene; una expresión ya calculada cuyo valor sigue en algún nombre se
+    # sustituye por una copia de ese nombre.
+    value_of = {}   # nombre -> número de valor
+    holders = {}    # número de valor -> nombres que lo contienen
+    table = {}      # ('const', c) o (op, vn1, vn2) -> número de valor
+
+    def number(operand):
+        if type(operand) is int:
+            key = ('const', operand)
+        elif operand in value_of:
+            return value_of[operand]
+        else:
+            key = ('input', operand)
+        if key not in table:
+            table[key] = len(table)
+        vn = table[key]
+        if isinstance(operand, NAMES):
+            value_of[operand] = vn
+            holders.setdefault(vn, set()).add(operand)
+        return vn
+
+    out = []
+    for quad in code:
+        op, a1, a2, res = quad
+        if a2 is None:
+            vn = number(a1)
+            replacement = quad
+        else:
+            v1, v2 = number(a1), number(a2)
+            if op in COMMUTATIVE and v2 < v1:
+                v1, v2 = v2, v1
+            key = (op, v1, v2)
+            vn = table.get(key)
+            holder = next(iter(holders.get(vn, ())), None) if vn is not None else None
+            if holder is not None:
+                replacement = ('=', holder, None, res)
+            else:
+                replacement = quad
+                if vn is None:
+                    vn = table[key] = len(table)
+        old = value_of.get(res)
+        if old is not None:
+            holders[old].discard(res)
+        value_of[res] = vn
+        holders.setdefault(vn, set()).add(res)
+        out.append(replacement)
+    return out
+
+
+def dead_code_elimination(code):
+    live = {res for _, _, _, res in code if temp_number(res) is None}
+    kept = []
+    for quad in reversed(code):
+        op, a1, a2, res = quad
+        if res not in live and not may_fail(quad):
+            continue
+        live.discard(res)
+        if isinstance(a1, NAMES):
+            live.add(a1)
+        if isinstance(a2, NAMES):
+            live.add(a2)
+        kept.append(quad)
+    kept.reverse()
+    return kept
+
+
+def coalesce_copies(code):
+    uses = {}
+    for _, a1, a2, _ in code:
+        for operand in (a1, a2):
+            if isinstance(operand, NAMES):
+                uses[operand] = uses.get(operand, 0) + 1
+    out = []
+    for quad in code:
+        op, a1, a2, res = quad
+        if out and a2 is None and temp_number(a1) is not None and uses.get(a1) == 1:
+            prev_op, p1, p2, prev_res = out[-1]
+            if prev_res == a1:
+                out[-1] = (prev_op, p1, p2, res)
+                continue
+        out.append(quad)
+    return out
+
+
+PASSES = (
+    ('constantes', constant_propagation),
+    ('copias', copy_propagation),
+    ('cse', common_subexpressions),
+    ('muertas', dead_code_elimination),
+    ('fusion', coalesce_copies),
+)
+
+
+def optimize(code, passes=PASSES, max_rounds=4):
+    """Aplica las pasadas hasta que el código deja de cambiar.
+
+    Devuelve (código_optimizado, estadísticas), donde las estadísticas son
+    tuplas (ronda, pasada, instrucciones_antes, instrucciones_después).
+    """
+    stats = []
+    for round_number in range(1, max_rounds + 1):
+        start = code
+        for name, run in passes:
+            before = len(code)
+            code = run(code)
+            stats.append((round_number, name, before, len(code)))
+        if code == start:
+            break
+    return code, stats
+
+
+def format_stats(stats):
+    lines = [f'ronda {r} {name:<11} {before:>8} -> {after:>8}' for r, name, before, after in stats]
+    if stats:
+        lines.append(f'total: {stats[0][2]} -> {stats[-1][3]} instrucciones')
+    return '\n'.join(lines)
+
+
+def main():
+    if len(sys.argv) != 2:
+        raise SystemExit('Uso: python optimizer.py archivo_fuente')
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        source = f.read()
+    try:
+        code = parse_and_generate(source)
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    optimized, stats = optimize(code)
+    print(format_tac(optimized))
+    print(format_stats(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
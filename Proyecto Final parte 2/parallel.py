@@ -0,0 +1,201 @@
+"""Compilación paralela de un único programa grande.
+
+El programa es una lista plana de sentencias terminadas en ';', así que el
+texto se corta en trozos que acaban en un ';' fuera de comentarios (se busca
+desde un inicio de línea, donde nunca hay un comentario abierto). Cada trozo
+se analiza en un proceso del pool con _ChunkParser, que numera sus
+temporales localmente y, en lugar de fallar con los nombres que no declaró
+él mismo, anota en orden el primer uso de cada uno.
+
+Al unir los resultados en orden se renumeran los temporales (y con ellos los
+índices de instrucción, que son la posición en la lista) y se comprueba cada
+uso anotado contra los nombres declarados en los trozos anteriores. El primer
+error en el orden del texto es el mismo que daría parse_and_generate, con el
+mismo mensaje, y sin errores el código es idéntico.
+
+Uso: python parallel.py archivo_fuente [-j N] [-o SALIDA]
+     python parallel.py --bench [sentencias]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from main import ID, Parser, TableLexer, Temp, Token, format_tac, parse_and_generate
+
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_CHARS = 1 << 16
+
+
+def _statement_end(text, pos):
+    """Posición tras el primer ';' fuera de comentarios desde pos (inicio de línea)."""
+    while True:
+        semicolon = text.find(';', pos)
+        if semicolon == -1:
+            return None
+        comment = text.find('#', pos, semicolon)
+        if comment == -1:
+            return semicolon + 1
+        newline = text.find('\n', comment)
+        if newline == -1:
+            return None
+        pos = newline + 1
+
+
+def split_chunks(text, count):
+    """Hasta count trozos consecutivos de text, cada uno terminado en un ';'."""
+    cuts = [0]
+    for i in range(1, count):
+        line_start = text.find('\n', max(len(text) * i // count, cuts[-1])) + 1
+        if line_start == 0:
+            break
+        end = _statement_end(text, line_start)
+        if end is None:
+            break
+        if end > cuts[-1]:
+            cuts.append(end)
+    cuts.append(len(text))
+    return [(text[a:b], a) for a, b in zip(cuts, cuts[1:]) if b > a or a == 0]
+
+
+class _ChunkLexer(TableLexer):
+    """TableLexer de un trozo: los errores indican la posición en el texto completo."""
+
+    def __init__(self, text, base):
+        super().__init__(text)
+        self.base = base
+
+    def error(self):
+        raise Exception(f'Error léxico en la posición {self.pos + self.base}')
+
+
+class _ChunkSymbols:
+    """Tabla de símbolos de un trozo: los nombres ajenos se aceptan y se anotan."""
+
+    def __init__(self):
+        self.declared = set()
+        self.external = {}  # nombre -> None, en el orden del primer uso
+
+    def __contains__(self, name):
+        if name not in self.declared and name not in self.external:
+            self.external[name] = None
+        return True
+
+    def add(self, name):
+        self.declared.add(name)
+
+
+class _ChunkParser(Parser):
+    # Temporales locales como enteros negativos (-1 es el primero): no se
+    # confunden con constantes ni con variables llamadas 'tN'
+    def new_temp(self):
+        self.temp_count += 1
+        return -self.temp_count
+
+
+def compile_chunk(job):
+    """Analiza un trozo. Devuelve (código, temporales, usos ajenos, declaradas, error)."""
+    text, base = job
+    symbols = _ChunkSymbols()
+    parser = None
+    try:
+        parser = _ChunkParser(_ChunkLexer(text, base))
+        parser.symbols = symbols
+        parser.program()
+        error = None
+    except Exception as e:
+        error = str(e)
+    if parser is None:
+        return [], 0, [], set(), error
+    return parser.code, parser.temp_count, list(symbols.external), symbols.declared, error
+
+
+def merge(results):
+    """Une los resultados en orden: renumera temporales y comprueba las declaraciones."""
+    code = []
+    declared = set()
+    offset = 0
+    for chunk_code, temp_count, external, declares, error in results:
+        for name in external:
+            if name not in declared:
+                raise Exception(f"Variable '{name}' no declarada en token {Token(ID, name)}")
+        if error is not None:
+            raise Exception(error)
+        declared |= declares
+        # names[k - 1] es el nombre global del temporal local -k
+        names = [Temp(n) for n in range(offset, offset + temp_count)]
+        code += [(op,
+                  names[-a1 - 1] if type(a1) is int and a1 < 0 else a1,
+                  names[-a2 - 1] if type(a2) is int and a2 < 0 else a2,
+                  names[-res - 1] if type(res) is int else res)
+                 for op, a1, a2, res in chunk_code]
+        offset += temp_count
+    return code
+
+
+def parallel_parse_and_generate(source_code, workers=None, executor=None):
+    """Como parse_and_generate, repartiendo los trozos entre procesos."""
+    workers = workers or os.cpu_count() or 1
+    count = max(1, min(workers * CHUNKS_PER_WORKER, len(source_code) // MIN_CHUNK_CHARS))
+    chunks = split_chunks(source_code, count)
+    if workers == 1 or len(chunks) == 1:
+        return merge(map(compile_chunk, chunks))
+    if executor is not None:
+        return merge(executor.map(compile_chunk, chunks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge(pool.map(compile_chunk, chunks))
+
+
+def bench(statements):
+    from bench_lexer import generate_source
+
+    source = generate_source(statements)
+    start = time.perf_counter()
+    expected = parse_and_generate(source)
+    sequential = time.perf_counter() - start
+    print(f'{len(source) / 2**20:.1f} MiB, {len(expected)} instrucciones')
+    print(f'secuencial        {sequential:8.3f} s')
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+    for workers in counts:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # El arranque del pool no se cuenta: se mide la compilación
+            list(pool.map(int, range(workers)))
+            start = time.perf_counter()
+            code = parallel_parse_and_generate(source, workers, pool)
+            elapsed = time.perf_counter() - start
+        if code != expected:
+            raise SystemExit(f'Error: el resultado con {workers} procesos no coincide con el secuencial')
+        print(f'{workers:2d} proceso(s)     {elapsed:8.3f} s  aceleración {sequential / elapsed:5.2f}x')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compila un programa grande en paralelo.')
+    arg_parser.add_argument('source', nargs='?', help='archivo fuente (o número de sentencias con --bench)')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None, help='procesos (por defecto, uno por núcleo)')
+    arg_parser.add_argument('-o', '--output', help='archivo de salida (por defecto, la salida estándar)')
+    arg_parser.add_argument('--bench', action='store_true', help='compara con el compilador secuencial')
+    args = arg_parser.parse_args()
+    if args.bench:
+        bench(int(args.source) if args.source else 1000000)
+        return 0
+    if args.source is None:
+        arg_parser.error('falta el archivo fuente')
+    with open(args.source, 'r', encoding='utf-8') as f:
+        source = f.read()
+    try:
+        code = parallel_parse_and_generate(source, args.jobs)
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            out.write(format_tac(code))
+    else:
+        print(format_tac(code))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
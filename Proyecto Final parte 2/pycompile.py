@@ -0,0 +1,168 @@
+"""Compila el código de 3 direcciones a una función de Python con el módulo ast.
+
+Cada cuádruplo pasa a ser una asignación entre variables locales: las
+variables del programa son los parámetros v0, v1, ... de la función y los
+temporales, ya reasignados con regalloc.allocate_temps, son unos pocos
+locales r0, r1, ... reutilizados. Las constantes quedan en línea. El módulo
+resultante se compila una sola vez con compile(), así que ejecutar el
+programa no tiene ningún bucle de despacho: es el bytecode de una función
+de Python de línea recta.
+
+La semántica es la de vm.Program: run(inputs) da valores iniciales a las
+variables (0 las que no se indiquen) y devuelve el entorno final, con las
+declaradas sin valor ('var x;') aunque no generen código; la división
+es entera truncando hacia cero y dividir por cero lanza TacRuntimeError con
+la misma instrucción en el mensaje.
+
+compile_source guarda los programas compilados por hash SHA-256 del fuente,
+así que volver a pedir el mismo fuente no vuelve a analizar ni compilar.
+
+Uso: python pycompile.py [archivo_fuente | numero_de_sentencias] [-r EJECUCIONES]
+"""
+import argparse
+import ast
+import hashlib
+import random
+import time
+from collections import OrderedDict
+
+from main import Parser, TableLexer, format_quad, temp_number
+from regalloc import allocate_temps
+from vm import Program, TacRuntimeError
+
+CACHE_SIZE = 64
+BINARY_OPERATORS = {'+': ast.Add, '-': ast.Sub, '*': ast.Mult}
+FUNCTION_NAME = 'tac_program'
+
+_cache = OrderedDict()  # hash del fuente -> CompiledProgram
+
+
+class CompiledProgram:
+    """Código de 3 direcciones compilado a una función de Python."""
+
+    def __init__(self, code, declared=()):
+        self.code = code
+        # Variables del programa (los temporales son Temp, no str) y después las
+        # declaradas que el código no usa, en el mismo orden que vm.Program
+        self.variables = list(dict.fromkeys(
+            name for quad in code for name in (quad[1], quad[2], quad[3]) if type(name) is str))
+        self.variables += sorted(set(declared) - set(self.variables))
+        module = self._build_module(allocate_temps(code)[0])
+        namespace = {'_divide': self._divide}
+        exec(compile(module, f'<tac {FUNCTION_NAME}>', 'exec'), namespace)
+        self.function = namespace[FUNCTION_NAME]
+
+    def _divide(self, a, b, pc):
+        if b == 0:
+            raise TacRuntimeError(
+                f'Error de ejecución: división por cero en la instrucción {format_quad(pc, self.code[pc])}')
+        q = a // b
+        # // redondea hacia abajo; se corrige para truncar hacia cero
+        if q < 0 and q * b != a:
+            q += 1
+        return q
+
+    def _build_module(self, code):
+        local_names = {name: f'v{i}' for i, name in enumerate(self.variables)}
+
+        def local(name):
+            # Los temporales reasignados t0, t1, ... pasan a r0, r1, ...
+            if name not in local_names:
+                local_names[name] = f'r{temp_number(name)}'
+            return local_names[name]
+
+        def load(operand):
+            if type(operand) is int:
+                return ast.Constant(operand)
+            return ast.Name(local(operand), ast.Load())
+
+        body = []
+        for pc, (op, a1, a2, res) in enumerate(code):
+            if a2 is None:
+                value = load(a1)
+            elif op == '/':
+                value = ast.Call(ast.Name('_divide', ast.Load()), [load(a1), load(a2), ast.Constant(pc)], [])
+            else:
+                value = ast.BinOp(load(a1), BINARY_OPERATORS[op](), load(a2))
+            body.append(ast.Assign([ast.Name(local(res), ast.Store())], value))
+        body.append(ast.Return(ast.Dict(
+            [ast.Constant(name) for name in self.variables],
+            [ast.Name(local_names[name], ast.Load()) for name in self.variables])))
+
+        arguments = ast.arguments(posonlyargs=[], args=[ast.arg(local_names[name]) for name in self.variables],
+                                  vararg=None, kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[])
+        function = ast.FunctionDef(FUNCTION_NAME, arguments, body, [], None)
+        return ast.fix_missing_locations(ast.Module([function], []))
+
+    def run(self, inputs=None):
+        """Ejecuta el programa y devuelve el entorno final de variables."""
+        if inputs:
+            return self.function(*[inputs.get(name, 0) for name in self.variables])
+        return self.function(*[0] * len(self.variables))
+
+
+def compile_source(source_code):
+    """Analiza y compila source_code, reutilizando la compilación si ya se hizo."""
+    key = hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+    program = _cache.get(key)
+    if program is not None:
+        _cache.move_to_end(key)
+        return program
+    parser = Parser(TableLexer(source_code))
+    parser.program()
+    program = CompiledProgram(parser.code, parser.symbols)
+    _cache[key] = program
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return program
+
+
+def benchmark(source, runs):
+    parser = Parser(TableLexer(source))
+    parser.program()
+    code = parser.code
+    print(f'{len(code)} instrucciones, {runs} ejecuciones con valores iniciales distintos')
+
+    start = time.perf_counter()
+    compiled = compile_source(source)
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    compile_source(source)
+    cached_time = time.perf_counter() - start
+    start = time.perf_counter()
+    vm_program = Program(code, parser.symbols)
+    resolve_time = time.perf_counter() - start
+    print(f'preparación: VM {resolve_time * 1000:.1f} ms, ast + compile() {compile_time * 1000:.1f} ms, '
+          f'desde la caché {cached_time * 1000:.3f} ms')
+
+    rng = random.Random(0)
+    inputs = [{name: rng.randint(-1000, 1000) for name in compiled.variables} for _ in range(runs)]
+    results = {}
+    for name, run in (('VM', vm_program.run), ('compilado', compiled.run)):
+        start = time.perf_counter()
+        results[name] = [run(values) for values in inputs]
+        elapsed = time.perf_counter() - start
+        print(f'{name:<10} {elapsed:8.3f} s  {len(code) * runs / elapsed:14,.0f} instrucciones/s')
+        results[name + ' tiempo'] = elapsed
+    if results['VM'] != results['compilado']:
+        raise SystemExit('Error: la VM y la función compilada no coinciden')
+    print(f'aceleración: {results["VM tiempo"] / results["compilado tiempo"]:.1f}x')
+
+
+def main():
+    from vm import generate_program
+
+    arg_parser = argparse.ArgumentParser(description='Compila el código de 3 direcciones a Python y lo compara con la VM.')
+    arg_parser.add_argument('source', nargs='?', default='200', help='archivo fuente o número de sentencias')
+    arg_parser.add_argument('-r', '--runs', type=int, default=2000, help='ejecuciones del programa')
+    args = arg_parser.parse_args()
+    if args.source.isdigit():
+        source = generate_program(int(args.source))
+    else:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            source = f.read()
+    benchmark(source, args.runs)
+
+
+if __name__ == '__main__':
+    main()
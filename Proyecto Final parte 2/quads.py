@@ -0,0 +1,147 @@
+"""Almacén columnar y compacto para cuádruplos de código de 3 direcciones.
+
+Cada instrucción ocupa un byte de opcode y tres enteros de 4 bytes, en lugar
+de una tupla de Python. Un operando >= 0 es un índice a la tabla de operandos
+internados (variables y constantes); los temporales 'tN' se guardan en línea
+como -(N + 2), sin cadena, y -1 representa la ausencia de arg2.
+
+Uso: python quads.py [numero_de_sentencias]  (compara la memoria con la lista de tuplas)
+"""
+import sys
+import tracemalloc
+from array import array
+
+from main import Parser, TableLexer, Temp, format_quad, temp_number
+
+OPCODES = ('=', '+', '-', '*', '/')
+OPCODE_INDEX = {op: i for i, op in enumerate(OPCODES)}
+NO_OPERAND = -1  # representa el None de arg2 en las copias
+
+
+class QuadStore:
+    def __init__(self, operands=None):
+        self.ops = array('B')
+        self.arg1 = array('i')
+        self.arg2 = array('i')
+        self.res = array('i')
+        # La tabla de operandos puede compartirse entre almacenes (p. ej. rebanadas)
+        self.operands = operands if operands is not None else []
+        self._index = {(type(value), value): i for i, value in enumerate(self.operands)}
+
+    @classmethod
+    def from_code(cls, code):
+        store = cls()
+        store.extend(code)
+        return store
+
+    def intern(self, value):
+        if value is None:
+            return NO_OPERAND
+        if type(value) is Temp:
+            return -temp_number(value) - 2
+        # Se distingue la constante 5 del nombre '5' (y True de 1) por el tipo
+        key = (type(value), value)
+        index = self._index.get(key)
+        if index is None:
+            index = len(self.operands)
+            self.operands.append(value)
+            self._index[key] = index
+        return index
+
+    def append(self, op, arg1, arg2, res):
+        self.ops.append(OPCODE_INDEX[op])
+        self.arg1.append(self.intern(arg1))
+        self.arg2.append(self.intern(arg2))
+        self.res.append(self.intern(res))
+
+    def extend(self, quads):
+        for quad in quads:
+            self.append(*quad)
+
+    # Permite usar el almacén como sink de Parser
+    __call__ = extend
+
+    def _operand(self, index):
+        if index >= 0:
+            return self.operands[index]
+        return None if index == NO_OPERAND else Temp(-index - 2)
+
+    def _quad(self, i):
+        operand = self._operand
+        return (OPCODES[self.ops[i]], operand(self.arg1[i]), operand(self.arg2[i]), operand(self.res[i]))
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __iter__(self):
+        operand = self._operand
+        for op, a1, a2, res in zip(self.ops, self.arg1, self.arg2, self.res):
+            yield (OPCODES[op], operand(a1), operand(a2), operand(res))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            part = QuadStore.__new__(QuadStore)
+            part.ops = self.ops[key]
+            part.arg1 = self.arg1[key]
+            part.arg2 = self.arg2[key]
+            part.res = self.res[key]
+            part.operands = self.operands
+            part._index = self._index
+            return part
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('índice de instrucción fuera de rango')
+        return self._quad(key)
+
+    def render(self, start=0):
+        """Listado de texto idéntico a format_tac (numerado desde start)."""
+        return "\n".join(format_quad(i, quad) for i, quad in enumerate(self, start))
+
+    def memory_usage(self):
+        """Bytes ocupados por las columnas y por la tabla de operandos."""
+        columns = sum(col.buffer_info()[1] * col.itemsize for col in (self.ops, self.arg1, self.arg2, self.res))
+        table = sys.getsizeof(self.operands) + sys.getsizeof(self._index)
+        table += sum(sys.getsizeof(value) for value in self.operands)
+        table += sum(sys.getsizeof(key) for key in self._index)
+        return {'columns': columns, 'operands': table, 'total': columns + table,
+                'per_instruction': (columns + table) / len(self) if len(self) else 0.0}
+
+
+def parse_and_generate_compact(source_code, lexer_class=TableLexer):
+    """Como parse_and_generate, pero vuelca cada sentencia en un QuadStore."""
+    store = QuadStore()
+    parser = Parser(lexer_class(source_code), sink=store)
+    parser.program()
+    return store
+
+
+def main():
+    from bench_lexer import generate_source
+    from main import parse_and_generate
+
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = generate_source(statements)
+
+    tracemalloc.start()
+    code = parse_and_generate(source)
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del code
+
+    tracemalloc.start()
+    store = parse_and_generate_compact(source)
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    usage = store.memory_usage()
+    n = len(store)
+    print(f'{n} instrucciones, {len(store.operands)} operandos distintos')
+    print(f'lista de tuplas: {list_bytes / n:8.1f} bytes/instrucción ({list_bytes / 2**20:.1f} MiB)')
+    print(f'QuadStore:       {store_bytes / n:8.1f} bytes/instrucción ({store_bytes / 2**20:.1f} MiB)')
+    print(f'  memory_usage(): columnas {usage["columns"]} B, operandos {usage["operands"]} B, '
+          f'{usage["per_instruction"]:.1f} bytes/instrucción')
+
+
+if __name__ == '__main__':
+    main()
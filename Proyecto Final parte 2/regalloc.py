@@ -0,0 +1,193 @@
+"""Análisis de vida y reasignación de temporales del código de 3 direcciones.
+
+Parser.new_temp crea un temporal nuevo por operador, pero en cada punto del
+programa solo unos pocos están vivos. Esta pasada recorre los cuádruplos de
+atrás hacia adelante manteniendo el conjunto de registros vivos como un
+vector de bits (un int de Python): un temporal se vuelve vivo en su último
+uso y muere en su definición, y en ese momento ocupa el registro libre más
+bajo. Como el código es un único bloque sin saltos, cada rango de vida es un
+intervalo y esta asignación voraz usa exactamente tantos registros como
+valores vivos simultáneos haya.
+
+Con un límite de K registros, cuando no queda ninguno libre se derrama el
+rango que más lejos llega hacia atrás (el de definición más temprana), como
+en linear scan. Los rangos derramados van a ranuras de memoria, reutilizadas
+entre rangos que no se solapan.
+
+Registros y ranuras siguen siendo temporales (main.Temp), pero en rangos de
+números separados para que el listado los distinga: los registros son
+t0..t{K-1} y las ranuras empiezan en la primera potencia de 10 con más cifras
+que K (spill_base): con -k 4 los registros son t0..t3 y las ranuras t10, t11,
+...; con -k 12, t0..t11 y t100, t101, ...
+
+Uso: python regalloc.py archivo_fuente [-k K] [-O]
+"""
+import argparse
+import heapq
+import sys
+
+from main import Temp, format_tac, parse_and_generate, temp_number
+
+
+class _Range:
+    """Rango de vida de un temporal: desde su definición hasta su último uso."""
+    __slots__ = ('start', 'end', 'reg', 'slot')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.reg = None
+        self.slot = None
+
+
+def spill_base(registers):
+    """Número del temporal de la primera ranura de memoria con K registros."""
+    return 10 ** len(str(registers))
+
+
+def allocate_temps(code, registers=None):
+    """Reasigna los temporales de code. Devuelve (código_nuevo, estadísticas).
+
+    registers: número máximo de registros K (None = sin límite, sin derrames).
+    """
+    if registers is not None and registers < 1:
+        raise ValueError('Se necesita al menos un registro')
+    # Temporales (main.Temp) definidos en el código, con el índice de su
+    # definición (los de Parser se definen una sola vez)
+    def_pc = {}
+    for pc, (_, _, _, res) in enumerate(code):
+        if temp_number(res) is not None:
+            def_pc[res] = pc
+    live = 0          # vector de bits de registros ocupados
+    holder = {}       # registro -> _Range que lo ocupa
+    current = {}      # temporal -> _Range vivo en este punto
+    spilled = []
+    renamed = [None] * len(code)
+    max_live = 0
+    registers_used = 0
+
+    def take_register(rng):
+        nonlocal live, registers_used
+        free = ~live & (live + 1)
+        reg = free.bit_length() - 1
+        if registers is None or reg < registers:
+            live |= free
+            rng.reg = reg
+            holder[reg] = rng
+            if reg >= registers_used:
+                registers_used = reg + 1
+            return
+        # Sin registros libres: se derrama el rango de definición más temprana
+        victim = min(holder.values(), key=lambda r: r.start)
+        if victim.start >= rng.start:
+            spilled.append(rng)
+            return
+        rng.reg = victim.reg
+        holder[rng.reg] = rng
+        victim.reg = None
+        spilled.append(victim)
+
+    def use(operand, pc):
+        rng = current[operand] = _Range(def_pc.get(operand, -1), pc)
+        take_register(rng)
+        return rng
+
+    for pc in range(len(code) - 1, -1, -1):
+        op, a1, a2, res = code[pc]
+        if res in def_pc:
+            rng = current.pop(res, None)
+            if rng is None:
+                # Definición muerta: necesita una ubicación solo en esta instrucción
+                rng = _Range(pc, pc)
+                take_register(rng)
+            if len(current) >= max_live:
+                max_live = len(current) + 1
+            rng.start = pc
+            reg = rng.reg
+            if reg is not None and holder.get(reg) is rng:
+                live &= ~(1 << reg)
+                del holder[reg]
+            res = rng
+        if a1 in def_pc:
+            a1 = current.get(a1) or use(a1, pc)
+        if a2 in def_pc:
+            a2 = current.get(a2) or use(a2, pc)
+        renamed[pc] = (op, a1, a2, res)
+        if len(current) > max_live:
+            max_live = len(current)
+
+    spill_slots = _assign_spill_slots(spilled)
+    names = [Temp(i) for i in range(registers_used)]
+    # Sin límite de registros no hay derrames (ni ranuras)
+    first_slot = spill_base(registers) if registers is not None else 0
+    slot_names = [Temp(first_slot + i) for i in range(spill_slots)]
+
+    def name(operand):
+        if type(operand) is not _Range:
+            return operand
+        return names[operand.reg] if operand.reg is not None else slot_names[operand.slot]
+
+    new_code = [(op, name(a1), name(a2), name(res)) for op, a1, a2, res in renamed]
+    stats = {
+        'temps_before': len(def_pc),
+        'max_live': max_live,
+        'registers': registers_used,
+        'spilled_ranges': len(spilled),
+        'spill_slots': spill_slots,
+        'temps_after': registers_used + spill_slots,
+    }
+    return new_code, stats
+
+
+def _assign_spill_slots(spilled):
+    """Colorea los rangos derramados (intervalos) con el mínimo de ranuras."""
+    busy = []   # montículo (último_uso, ranura)
+    free = []   # montículo de ranuras libres
+    slots = 0
+    for rng in sorted(spilled, key=lambda r: r.start):
+        # Una ranura se puede reutilizar si su rango termina donde empieza éste
+        # (la instrucción lee el operando antes de escribir el resultado)
+        while busy and busy[0][0] <= rng.start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            rng.slot = heapq.heappop(free)
+        else:
+            rng.slot = slots
+            slots += 1
+        heapq.heappush(busy, (rng.end, rng.slot))
+    return slots
+
+
+def format_stats(stats):
+    return (f"temporales: {stats['temps_before']} -> {stats['temps_after']}  "
+            f"(máximo vivos: {stats['max_live']}, registros: {stats['registers']}, "
+            f"rangos derramados: {stats['spilled_ranges']}, ranuras de memoria: {stats['spill_slots']})")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Reasigna los temporales del código de 3 direcciones.')
+    arg_parser.add_argument('source', help='archivo fuente')
+    arg_parser.add_argument('-k', '--registers', type=int, default=None,
+                            help='número máximo de registros (el resto se derrama a memoria)')
+    arg_parser.add_argument('-O', '--optimize', action='store_true', help='optimiza antes de asignar')
+    args = arg_parser.parse_args()
+    if args.registers is not None and args.registers < 1:
+        arg_parser.error('--registers debe ser al menos 1')
+    with open(args.source, 'r', encoding='utf-8') as f:
+        source = f.read()
+    try:
+        code = parse_and_generate(source)
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    if args.optimize:
+        from optimizer import optimize
+        code, _ = optimize(code)
+    code, stats = allocate_temps(code, args.registers)
+    print(format_tac(code))
+    print(format_stats(stats))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
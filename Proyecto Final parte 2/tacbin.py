@@ -0,0 +1,335 @@
+"""Formato binario versionado para el código de 3 direcciones (.tacb).
+
+Estructura (enteros little-endian):
+
+  cabecera   'TACB', versión (u16), bytes por registro (u16)
+  registros  uno por instrucción: opcode, arg1, arg2, res (4 x i32)
+  tabla      operandos: tipo (u8: 0 nombre, 1 entero), longitud (u32), texto UTF-8
+  pie        instrucciones (u64), posición de la tabla (u64), operandos (u32), 'TACE'
+
+Los operandos se codifican como en QuadStore: >= 0 es un índice en la tabla,
+-1 la ausencia de arg2 y -(N + 2) el temporal tN. La tabla y los contadores
+van al final para que BinaryTacWriter escriba en un solo recorrido, también a
+través de gzip o lzma. TacFile abre un archivo sin comprimir con mmap y lee
+los registros directamente del mapa (memoryview, sin copias); uno comprimido
+se descomprime una vez en memoria.
+
+Uso: python tacbin.py compile FUENTE SALIDA [--compress gzip|lzma]
+     python tacbin.py text ENTRADA [-o SALIDA]
+     python tacbin.py bench [sentencias]
+"""
+import argparse
+import gzip
+import lzma
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from main import Parser, StreamLexer, Temp, format_quad
+from quads import NO_OPERAND, OPCODE_INDEX, OPCODES, QuadStore
+
+MAGIC = b'TACB'
+END_MAGIC = b'TACE'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+RECORD = struct.Struct('<iiii')
+FOOTER = struct.Struct('<QQI4s')
+STRING_ENTRY = struct.Struct('<BI')
+KIND_NAME, KIND_INTEGER = 0, 1
+BUFFER_SIZE = 1 << 20
+COMPRESSORS = {'gzip': gzip.open, 'lzma': lzma.open}
+# Los registros se leen como enteros nativos: sin copia solo en máquinas little-endian
+NATIVE_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def open_output(path, compress=None):
+    if compress is None:
+        return open(path, 'wb')
+    if compress not in COMPRESSORS:
+        raise Exception(f'Compresión desconocida: {compress}')
+    return COMPRESSORS[compress](path, 'wb')
+
+
+class BinaryTacWriter:
+    """Escribe cuádruplos en formato .tacb; se puede usar como sink de Parser.
+
+    Los registros se acumulan en un búfer de buffer_size bytes antes de
+    escribirse. close() añade la tabla de operandos y el pie.
+    """
+
+    def __init__(self, out, buffer_size=BUFFER_SIZE):
+        self.out = out
+        self.buffer_size = buffer_size
+        self.table = QuadStore()  # solo para internar operandos
+        self.records = array('i')
+        self.count = 0
+        self.written = HEADER.size
+        out.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def __call__(self, quads):
+        intern = self.table.intern
+        records = self.records
+        for op, a1, a2, res in quads:
+            records.extend((OPCODE_INDEX[op], intern(a1), intern(a2), intern(res)))
+        self.count += len(quads)
+        if len(records) * records.itemsize >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        if not NATIVE_LITTLE_ENDIAN:
+            self.records.byteswap()
+        data = self.records.tobytes()
+        self.out.write(data)
+        self.written += len(data)
+        self.records = array('i')
+
+    def close(self):
+        self._flush()
+        table = bytearray()
+        for value in self.table.operands:
+            kind = KIND_NAME if type(value) is str else KIND_INTEGER
+            text = str(value).encode('utf-8')
+            table += STRING_ENTRY.pack(kind, len(text))
+            table += text
+        self.out.write(table)
+        self.out.write(FOOTER.pack(self.count, self.written, len(self.table.operands), END_MAGIC))
+
+
+def write_tacb(code, path, compress=None):
+    with open_output(path, compress) as out:
+        writer = BinaryTacWriter(out)
+        writer(code)
+        writer.close()
+    return writer.count
+
+
+class TacFile:
+    """Lector de .tacb. Se indexa e itera como una lista de cuádruplos."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = self._data = self.records = self.words = None
+        try:
+            start = self._file.read(6)
+            if start[:2] == b'\x1f\x8b':
+                data = gzip.decompress(start + self._file.read())
+            elif start == b'\xfd7zXZ\x00':
+                data = lzma.decompress(start + self._file.read())
+            elif not start:
+                # mmap no admite archivos vacíos; _load lo rechaza como truncado
+                data = b''
+            else:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._map
+            self._data = memoryview(data)
+            self._load()
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self):
+        data = self._data
+        if len(data) < HEADER.size + FOOTER.size:
+            raise Exception('Archivo .tacb truncado')
+        magic, version, record_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise Exception('No es un archivo .tacb')
+        if version != VERSION or record_size != RECORD.size:
+            raise Exception(f'Versión de .tacb no soportada: {version}')
+        count, table_offset, operand_count, end_magic = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        if end_magic != END_MAGIC or table_offset != HEADER.size + count * RECORD.size:
+            raise Exception('Archivo .tacb dañado o truncado')
+        self.count = count
+        self.records = data[HEADER.size:table_offset]
+        if NATIVE_LITTLE_ENDIAN:
+            self.words = self.records.cast('i')
+        else:
+            words = array('i', self.records)
+            words.byteswap()
+            self.words = memoryview(words)
+        self.operands = []
+        pos = table_offset
+        for _ in range(operand_count):
+            kind, length = STRING_ENTRY.unpack_from(data, pos)
+            pos += STRING_ENTRY.size
+            text = str(data[pos:pos + length], 'utf-8')
+            pos += length
+            self.operands.append(text if kind == KIND_NAME else int(text))
+
+    def _operand(self, index):
+        if index >= 0:
+            return self.operands[index]
+        return None if index == NO_OPERAND else Temp(-index - 2)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError('índice de instrucción fuera de rango')
+        op, a1, a2, res = self.words[4 * i:4 * i + 4]
+        operand = self._operand
+        return (OPCODES[op], operand(a1), operand(a2), operand(res))
+
+    def __iter__(self):
+        operand = self._operand
+        words = self.words
+        for op, a1, a2, res in zip(words[0::4], words[1::4], words[2::4], words[3::4]):
+            yield (OPCODES[op], operand(a1), operand(a2), operand(res))
+
+    def write_text(self, out):
+        """Escribe el listado de texto, idéntico a format_tac."""
+        lines = (format_quad(i, quad) for i, quad in enumerate(self))
+        first = next(lines, None)
+        if first is not None:
+            out.write(first)
+            for line in lines:
+                out.write('\n')
+                out.write(line)
+
+    def close(self):
+        # Las vistas deben liberarse antes de cerrar el mapa; si __init__ falló,
+        # algunas no llegaron a crearse
+        for view in (self.words, self.records, self._data):
+            if view is not None:
+                view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def compile_to_tacb(source_path, output_path, compress=None):
+    """Compila source_path directamente a .tacb, sentencia a sentencia."""
+    with open(source_path, 'rb') as source:
+        try:
+            with open_output(output_path, compress) as out:
+                writer = BinaryTacWriter(out)
+                Parser(StreamLexer(source), sink=writer).program()
+                writer.close()
+        except BaseException:
+            # No se deja un .tacb parcial (sin pie) de un archivo con errores
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+    return writer.count
+
+
+def bench(statements):
+    import io
+    import os
+    import re
+    import tempfile
+    import time
+
+    from bench_lexer import generate_source
+    from main import format_tac, parse_and_generate
+
+    line_pattern = re.compile(r'\d+: (\S+) = (\S+)(?: (\S) (\S+))?')
+    temp_pattern = re.compile(r't\d+')
+
+    def operand(text):
+        if text.isdigit():
+            return int(text)
+        # El listado no distingue un temporal de una variable llamada tN; los
+        # programas generados no tienen variables así
+        return Temp(int(text[1:])) if temp_pattern.fullmatch(text) else text
+
+    def load_text(path):
+        """Lo que hace hoy una herramienta externa: releer el listado con una regex."""
+        with open(path, 'r', encoding='utf-8') as f:
+            code = []
+            for line in f:
+                res, a1, op, a2 = line_pattern.match(line).groups()
+                code.append((op or '=', operand(a1), operand(a2) if a2 else None, operand(res)))
+        return code
+
+    def load_binary(path):
+        with TacFile(path) as tac:
+            return list(tac)
+
+    code = parse_and_generate(generate_source(statements))
+    print(f'{len(code)} instrucciones')
+    with tempfile.TemporaryDirectory() as folder:
+        text_path = os.path.join(folder, 'codigo.txt')
+        start = time.perf_counter()
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(format_tac(code))
+        rows = [('texto', text_path, time.perf_counter() - start, load_text)]
+        for compress in (None, 'gzip', 'lzma'):
+            path = os.path.join(folder, f'codigo.tacb.{compress}')
+            start = time.perf_counter()
+            write_tacb(code, path, compress)
+            rows.append((f'tacb {compress or ""}'.strip(), path, time.perf_counter() - start, load_binary))
+
+        text_size = os.path.getsize(text_path)
+        print(f'{"formato":<10} {"tamaño":>12} {"relativo":>9} {"escritura":>10} {"carga":>9}')
+        for name, path, write_time, load in rows:
+            start = time.perf_counter()
+            loaded = load(path)
+            load_time = time.perf_counter() - start
+            if loaded != code:
+                raise SystemExit(f'Error: {name} no reproduce el código original')
+            size = os.path.getsize(path)
+            print(f'{name:<10} {size:12,d} {size / text_size:8.2f}x {write_time:9.3f}s {load_time:8.3f}s')
+
+        path = rows[1][1]
+        start = time.perf_counter()
+        with TacFile(path) as tac:
+            last = tac[len(tac) - 1]
+        print(f'abrir .tacb y leer la última instrucción: {(time.perf_counter() - start) * 1000:.2f} ms')
+        out = io.StringIO()
+        with TacFile(path) as tac:
+            tac.write_text(out)
+        if out.getvalue() != format_tac(code) or last != code[-1]:
+            raise SystemExit('Error: la conversión a texto no coincide con format_tac')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Formato binario de código de 3 direcciones.')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    compile_parser = commands.add_parser('compile', help='compila un fuente a .tacb')
+    compile_parser.add_argument('source')
+    compile_parser.add_argument('output')
+    compile_parser.add_argument('--compress', choices=sorted(COMPRESSORS))
+    text_parser = commands.add_parser('text', help='convierte un .tacb al listado de texto')
+    text_parser.add_argument('input')
+    text_parser.add_argument('-o', '--output', help='archivo de salida (por defecto, la salida estándar)')
+    bench_parser = commands.add_parser('bench', help='compara tamaño y tiempo de carga con el texto')
+    bench_parser.add_argument('statements', nargs='?', type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    if args.command == 'compile':
+        try:
+            count = compile_to_tacb(args.source, args.output, args.compress)
+        except Exception as e:
+            print(f'Error: {e}', file=sys.stderr)
+            return 1
+        print(f'{count} instrucciones en {args.output}')
+    elif args.command == 'text':
+        try:
+            with TacFile(args.input) as tac:
+                if args.output:
+                    with open(args.output, 'w', encoding='utf-8') as out:
+                        tac.write_text(out)
+                else:
+                    tac.write_text(sys.stdout)
+        except Exception as e:
+            print(f'Error: {e}', file=sys.stderr)
+            return 1
+    else:
+        bench(args.statements)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Flujo de tokens empaquetado en arreglos paralelos.
+
+En lugar de un objeto Token por token, TokenStream guarda el tipo de cada
+token como un código de un byte en un array('B') y sus posiciones de inicio
+y fin en el texto en dos arreglos de enteros. El valor (el lexema, o el int
+de un INTEGER) solo se construye cuando se pide, cortándolo del texto fuente.
+
+La ventaja es solo de memoria: guardar todos los tokens de un texto ocupa unos
+9 bytes por token en lugar de un objeto Token cada uno. Para analizar,
+PackedLexer entrega los tokens del flujo a main.Parser (la misma gramática,
+sin recursión) creando cada Token al pedirlo; como el texto se recorre dos
+veces (al construir el flujo y al entregarlo), es algo más lento que
+TableLexer, no más rápido.
+
+Si el texto tiene un carácter inválido el flujo termina en un token LEX_ERROR
+en esa posición y el error se lanza al llegar a él, como en TableLexer: un
+error de sintaxis anterior se sigue informando primero.
+
+Uso: python tokens.py [numero_de_sentencias]  (memoria por token y velocidad frente a Token)
+"""
+import re
+import sys
+import time
+import tracemalloc
+from array import array
+from itertools import accumulate, compress, islice
+
+from main import (
+    ASSIGN, CHUNK_SIZE, DIVIDE, EOF, ID, INTEGER, LPAREN, MASTER_PATTERN, MINUS, PLUS,
+    RESERVED_KEYWORDS, RPAREN, SEMICOLON, SINGLE_CHAR_TOKENS, TIMES,
+    Parser, TableLexer, Token,
+)
+
+# Tipos de token por código; el último marca un error léxico
+KIND_NAMES = (EOF, INTEGER, ID, PLUS, MINUS, TIMES, DIVIDE, LPAREN, RPAREN, ASSIGN, SEMICOLON,
+              'VAR', 'IF', 'ELSE', 'WHILE', 'FOR', 'LEX_ERROR')
+KIND_CODE = {name: code for code, name in enumerate(KIND_NAMES)}
+(K_EOF, K_INTEGER, K_ID, K_PLUS, K_MINUS, K_TIMES, K_DIVIDE, K_LPAREN, K_RPAREN, K_ASSIGN,
+ K_SEMICOLON, K_VAR, K_IF, K_ELSE, K_WHILE, K_FOR, K_LEX_ERROR) = range(len(KIND_NAMES))
+
+SINGLE_CHAR_CODES = {char: KIND_CODE[kind] for char, kind in SINGLE_CHAR_TOKENS.items()}
+KEYWORD_CODES = {word: KIND_CODE[kind] for word, kind in RESERVED_KEYWORDS.items()}
+
+
+# Código (no guardado) de espacios y comentarios
+K_SKIP = 255
+
+# Igual que MASTER_PATTERN pero también reconoce los espacios, así los trozos
+# cubren el texto sin huecos y sus posiciones son la suma de sus longitudes
+SCAN_PATTERN = re.compile(r'\s+|' + MASTER_PATTERN.pattern)
+
+
+def _classify(lexeme):
+    first = lexeme[0]
+    if first.isalpha():
+        return KEYWORD_CODES.get(lexeme, K_ID)
+    if first.isdigit():
+        return K_INTEGER
+    if first == '#' or first.isspace():
+        return K_SKIP
+    return K_LEX_ERROR
+
+
+class _Classifier(dict):
+    """Caché lexema -> código: los mismos nombres y números se repiten mucho."""
+
+    def __missing__(self, lexeme):
+        kind = self[lexeme] = _classify(lexeme)
+        return kind
+
+
+class TokenStream:
+    def __init__(self, text):
+        self.text = text
+        # 4 bytes por posición bastan salvo para textos de más de 4 GiB
+        typecode = 'I' if len(text) < 1 << 32 else 'Q'
+        self.kinds = array('B')
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self._scan()
+
+    def _scan(self):
+        # Todo el trabajo por token ocurre en C (findall, map, accumulate,
+        # compress); en Python solo se itera por bloques
+        text = self.text
+        length = len(text)
+        classify = _Classifier(SINGLE_CHAR_CODES).__getitem__
+        findall = SCAN_PATTERN.findall
+        is_token = K_SKIP.__gt__
+        start = 0
+        while start < length:
+            end = text.find('\n', start + CHUNK_SIZE)
+            end = length if end == -1 else end + 1
+            pieces = findall(text, start, end)
+            codes = list(map(classify, pieces))
+            bounds = list(accumulate(map(len, pieces), initial=start))
+            if K_LEX_ERROR in codes:
+                cut = codes.index(K_LEX_ERROR) + 1
+                del codes[cut:], bounds[cut + 1:]
+            keep = list(map(is_token, codes))
+            self.kinds.extend(compress(codes, keep))
+            self.starts.extend(compress(bounds, keep))
+            self.ends.extend(compress(islice(bounds, 1, None), keep))
+            if codes and codes[-1] == K_LEX_ERROR:
+                self.ends[-1] = self.starts[-1]
+                return
+            start = end
+        self.kinds.append(K_EOF)
+        self.starts.append(length)
+        self.ends.append(length)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def value(self, i):
+        kind = self.kinds[i]
+        if kind == K_EOF:
+            return None
+        lexeme = self.text[self.starts[i]:self.ends[i]]
+        return int(lexeme) if kind == K_INTEGER else lexeme
+
+    def token(self, i):
+        """Token equivalente al de TableLexer (solo para mensajes y comparaciones)."""
+        return Token(KIND_NAMES[self.kinds[i]], self.value(i))
+
+    def memory_usage(self):
+        return sum(col.buffer_info()[1] * col.itemsize for col in (self.kinds, self.starts, self.ends))
+
+
+class PackedLexer:
+    """Interfaz de lexer (get_next_token) sobre un TokenStream, para main.Parser."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._tokens = self._replay()
+
+    def _replay(self):
+        stream = self.stream
+        text = stream.text
+        for kind, start, end in zip(stream.kinds, stream.starts, stream.ends):
+            if kind == K_INTEGER:
+                yield Token(INTEGER, int(text[start:end]))
+            elif kind == K_ID:
+                yield Token(ID, text[start:end])
+            elif kind == K_LEX_ERROR:
+                raise Exception(f'Error léxico en la posición {start}')
+            elif kind != K_EOF:
+                yield Token(KIND_NAMES[kind], text[start:end])
+
+    def get_next_token(self):
+        token = next(self._tokens, None)
+        return token if token is not None else Token(EOF, None)
+
+
+def parse_and_generate_packed(source_code):
+    parser = Parser(PackedLexer(TokenStream(source_code)))
+    parser.program()
+    return parser.code
+
+
+def main():
+    from bench_lexer import generate_source
+    from main import parse_and_generate
+
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    source = generate_source(statements)
+
+    # Memoria retenida por todos los tokens de cada representación
+    tracemalloc.start()
+    lexer = TableLexer(source)
+    tokens = []
+    token = lexer.get_next_token()
+    while token.type != EOF:
+        tokens.append(token)
+        token = lexer.get_next_token()
+    object_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = len(tokens)
+    del tokens, lexer
+
+    tracemalloc.start()
+    stream = TokenStream(source)
+    stream_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{count} tokens')
+    print(f'Token por objeto: {object_bytes / count:8.1f} bytes/token')
+    print(f'TokenStream:      {stream_bytes / count:8.1f} bytes/token '
+          f'(arreglos: {stream.memory_usage() / count:.1f})')
+
+    results = {}
+    for name, run in (('Parser + TableLexer', lambda: parse_and_generate(source)),
+                      ('Parser + PackedLexer', lambda: parse_and_generate_packed(source))):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            results[name] = run()
+            best = min(best, time.perf_counter() - start)
+        print(f'{name:<20} {best:8.3f} s  {count / best:12,.0f} tokens/s')
+    if results['Parser + PackedLexer'] != results['Parser + TableLexer']:
+        raise SystemExit('Error: PackedLexer no da el mismo código que TableLexer')
+
+
+if __name__ == '__main__':
+    main()
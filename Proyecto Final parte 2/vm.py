@@ -0,0 +1,197 @@
+"""Máquina virtual para el código de 3 direcciones generado por Parser.
+
+Antes de ejecutar, cada variable, temporal y constante se resuelve a una
+ranura (índice) de una lista de registros; las constantes se precargan en sus
+ranuras. Cada cuádruplo queda como (función, destino, origen1, origen2), donde
+la función sale de una tabla indexada por opcode, y el bucle de ejecución
+solo hace registros[d] = f(registros[a], registros[b]).
+
+La división es entera y trunca hacia cero, como en C/C++. Dividir por cero
+lanza TacRuntimeError indicando la instrucción.
+
+Uso: python vm.py [archivo_fuente | numero_de_sentencias]
+"""
+import operator
+import random
+import sys
+import time
+from functools import partial
+
+from main import Parser, TableLexer, format_quad, temp_number
+from quads import OPCODE_INDEX
+
+
+class TacRuntimeError(Exception):
+    pass
+
+
+def _copy(a, b):
+    return a
+
+
+def _divide(pc, quad, a, b):
+    if b == 0:
+        raise TacRuntimeError(f'Error de ejecución: división por cero en la instrucción {format_quad(pc, quad)}')
+    q = a // b
+    # // redondea hacia abajo; se corrige para truncar hacia cero
+    if q < 0 and q * b != a:
+        q += 1
+    return q
+
+
+# Indexada por quads.OPCODE_INDEX: '=', '+', '-', '*', '/'
+HANDLERS = (_copy, operator.add, operator.sub, operator.mul, _divide)
+
+
+class Program:
+    """Código de 3 direcciones ya resuelto a ranuras, listo para ejecutarse.
+
+    declared: variables declaradas en el programa (p. ej. Parser.symbols). Una
+    declaración sin valor ('var x;') no genera código, así que sin ellas esas
+    variables no aparecerían en el resultado.
+    """
+
+    def __init__(self, code, declared=()):
+        self.slots = {}
+        self.registers = []
+        self.instructions = []
+        constants = {}
+        for pc, quad in enumerate(code):
+            op, a1, a2, res = quad
+            handler = HANDLERS[OPCODE_INDEX[op]]
+            if handler is _divide:
+                handler = partial(_divide, pc, quad)
+            a = self._slot(a1, constants)
+            # En las copias el segundo operando no se usa: se repite el primero
+            b = self._slot(a2, constants) if a2 is not None else a
+            self.instructions.append((handler, self._slot(res, constants), a, b))
+        # Variables del programa (no temporales), en orden de aparición; después,
+        # ordenadas, las declaradas que el código no usa
+        self.variables = [name for name in self.slots if type(name) is str]
+        unused = sorted(set(declared) - self.slots.keys())
+        for name in unused:
+            self._slot(name, constants)
+        self.variables += unused
+
+    def _slot(self, operand, constants):
+        if type(operand) is int:
+            slot = constants.get(operand)
+            if slot is None:
+                slot = constants[operand] = len(self.registers)
+                self.registers.append(operand)
+            return slot
+        slot = self.slots.get(operand)
+        if slot is None:
+            slot = self.slots[operand] = len(self.registers)
+            self.registers.append(0)
+        return slot
+
+    def run(self, inputs=None):
+        """Ejecuta el programa y devuelve el entorno final de variables.
+
+        inputs da valores iniciales a variables; las que no se indiquen
+        (p. ej. 'var x;' sin inicializar) empiezan en 0.
+        """
+        registers = self.registers[:]
+        if inputs:
+            slots = self.slots
+            for name, value in inputs.items():
+                if name in slots:
+                    registers[slots[name]] = value
+        for handler, d, a, b in self.instructions:
+            registers[d] = handler(registers[a], registers[b])
+        slots = self.slots
+        return {name: registers[slots[name]] for name in self.variables}
+
+
+def run_tac(code, inputs=None, declared=()):
+    return Program(code, declared).run(inputs)
+
+
+def load_program(source_code):
+    """Analiza source_code y lo prepara para ejecutarse, con todas sus variables."""
+    parser = Parser(TableLexer(source_code))
+    parser.program()
+    return Program(parser.code, parser.symbols)
+
+
+def naive_run(code, inputs=None, declared=()):
+    """Intérprete directo (comparando op como cadena), solo como referencia del benchmark."""
+    # Como en Program, todas las variables (usadas o solo declaradas) empiezan en 0
+    env = dict.fromkeys(declared, 0)
+    for quad in code:
+        for operand in quad[1:]:
+            if type(operand) is str:
+                env[operand] = 0
+    env.update(inputs or {})
+    for op, a1, a2, res in code:
+        x = a1 if type(a1) is int else env.get(a1, 0)
+        if a2 is None:
+            env[res] = x
+            continue
+        y = a2 if type(a2) is int else env.get(a2, 0)
+        if op == '+':
+            env[res] = x + y
+        elif op == '-':
+            env[res] = x - y
+        elif op == '*':
+            env[res] = x * y
+        elif op == '/':
+            if y == 0:
+                raise TacRuntimeError('Error de ejecución: división por cero')
+            q = x // y
+            env[res] = q + 1 if q < 0 and q * y != x else q
+    return {name: value for name, value in env.items() if temp_number(name) is None}
+
+
+def benchmark(code, declared=(), repeat=3):
+    program = Program(code, declared)
+    results = {}
+    for name, run in (('intérprete directo', lambda: naive_run(code, declared=declared)), ('VM', program.run)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            env = run()
+            best = min(best, time.perf_counter() - start)
+        results[name] = env
+        print(f'{name:<20} {best:8.3f} s  {len(code) / best:14,.0f} instrucciones/s')
+    if results['VM'] != results['intérprete directo']:
+        raise SystemExit('Error: la VM y el intérprete directo no coinciden')
+
+
+def generate_program(statements, seed=0):
+    """Programa con todos los operadores cuyos valores se mantienen acotados.
+
+    Incluye una variable declarada sin valor ('var entrada;') que solo se lee.
+    """
+    rng = random.Random(seed)
+    names = [f'valor{i}' for i in range(50)]
+    lines = ['var entrada;'] + [f'var {name} = {i};' for i, name in enumerate(names)]
+    operands = names + ['entrada']
+    for _ in range(statements):
+        a, b, c = rng.choice(names), rng.choice(operands), rng.choice(operands)
+        lines.append(f'{a} = {b} * 3 / 4 + {rng.randint(0, 1000)} - ({c} + 1) / 2;')
+    return '\n'.join(lines)
+
+
+def main():
+    arg = sys.argv[1] if len(sys.argv) > 1 else '50000'
+    if arg.isdigit():
+        source = generate_program(int(arg))
+    else:
+        with open(arg, 'r', encoding='utf-8') as f:
+            source = f.read()
+    try:
+        parser = Parser(TableLexer(source))
+        parser.program()
+        print(f'{len(parser.code)} instrucciones')
+        benchmark(parser.code, parser.symbols)
+    except Exception as e:
+        # Errores léxicos o de sintaxis, o TacRuntimeError al ejecutar
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Trabajos en segundo plano para la interfaz gráfica.
+
+BackgroundJob ejecuta work(report) en un hilo aparte. El trabajo llama a
+report(fase, hechos, total) de vez en cuando: así publica su progreso y, si se
+pidió cancelar, report lanza Cancelled y el trabajo termina en ese punto.
+
+Tkinter no se puede usar desde otro hilo, así que el hilo nunca toca la
+interfaz. Deja el último progreso y el resultado en atributos, y el hilo de
+Tk los recoge cada POLL_MS con root.after, llamando a on_progress, on_done,
+on_error u on_cancel. root puede ser cualquier objeto con after(ms, función).
+"""
+import threading
+
+POLL_MS = 50
+
+
+class Cancelled(Exception):
+    pass
+
+
+class BackgroundJob:
+    def __init__(self, root, work, on_done, on_error, on_progress=None, on_cancel=None):
+        self.root = root
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.cancel_event = threading.Event()
+        self.latest = None          # (fase, hechos, total), lo escribe el hilo
+        self._shown = None
+        self._outcome = None        # ('done', resultado) | ('error', excepción) | ('cancel', None)
+        self.thread = threading.Thread(target=self._run, args=(work,), daemon=True)
+        self.thread.start()
+        root.after(POLL_MS, self._poll)
+
+    def report(self, phase, done, total):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+        self.latest = (phase, done, total)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def running(self):
+        return self._outcome is None
+
+    def _run(self, work):
+        try:
+            outcome = ('done', work(self.report))
+        except Cancelled:
+            outcome = ('cancel', None)
+        except Exception as e:
+            outcome = ('error', e)
+        self._outcome = outcome
+
+    def _poll(self):
+        latest = self.latest
+        if latest is not None and latest != self._shown and self.on_progress is not None:
+            self._shown = latest
+            self.on_progress(*latest)
+        if self._outcome is None:
+            self.root.after(POLL_MS, self._poll)
+            return
+        kind, value = self._outcome
+        if kind == 'done':
+            self.on_done(value)
+        elif kind == 'error':
+            self.on_error(value)
+        elif self.on_cancel is not None:
+            self.on_cancel()
@@ -0,0 +1,85 @@
+"""Generador reproducible (con semilla) de expresiones y programas sintéticos.
+
+Las expresiones siguen la gramática común a las prácticas (números o
+identificadores, + - * / y paréntesis hasta una profundidad dada); los
+programas siguen la de los proyectos finales: declaraciones 'var x = expr;'
+seguidas de asignaciones 'x = expr;' con comentarios intercalados. Con
+error_density > 0 una fracción de las expresiones o sentencias lleva un
+error (sintáctico, léxico o de variable no declarada).
+"""
+import random
+
+OPERATORS = ('+', '-', '*', '/')
+
+
+def generate_expression(rng, operators, depth, operand, sep=' '):
+    """Expresión con operators operadores y como mucho depth paréntesis abiertos."""
+    parts = []
+    open_parens = 0
+    for i in range(operators + 1):
+        while open_parens < depth and rng.random() < 0.25:
+            parts.append('(')
+            open_parens += 1
+        parts.append(operand())
+        while open_parens and rng.random() < 0.25:
+            parts.append(')')
+            open_parens -= 1
+        if i < operators:
+            parts.append(rng.choice(OPERATORS))
+    parts.extend(')' * open_parens)
+    return sep.join(parts)
+
+
+def _break_expression(rng, expression, sep):
+    choice = rng.randrange(3)
+    if choice == 0:
+        return expression + sep + rng.choice(OPERATORS)  # falta un operando
+    if choice == 1:
+        return '(' + sep + expression                     # paréntesis sin cerrar
+    return expression + sep + '@'                         # carácter inválido
+
+
+def generate_expressions(count, operators=20, depth=4, identifiers=0, error_density=0.0,
+                         sep=' ', seed=0):
+    """count expresiones; con identifiers > 0 los operandos mezclan nombres y números."""
+    rng = random.Random(seed)
+    names = [f'x{i}' for i in range(identifiers)]
+
+    def operand():
+        if names and rng.random() < 0.5:
+            return rng.choice(names)
+        return str(rng.randint(0, 999))
+
+    expressions = []
+    for _ in range(count):
+        expression = generate_expression(rng, operators, depth, operand, sep)
+        if rng.random() < error_density:
+            expression = _break_expression(rng, expression, sep)
+        expressions.append(expression)
+    return expressions
+
+
+def generate_program(statements, operators=6, depth=3, identifiers=50, error_density=0.0, seed=0):
+    """Programa de los proyectos finales con statements asignaciones."""
+    rng = random.Random(seed)
+    names = [f'valor{i}' for i in range(identifiers)]
+
+    def operand():
+        return rng.choice(names) if rng.random() < 0.6 else str(rng.randint(0, 999))
+
+    lines = [f'var {name} = {i};' for i, name in enumerate(names)]
+    for i in range(statements):
+        expression = generate_expression(rng, rng.randint(1, operators), depth, operand)
+        line = f'{rng.choice(names)} = {expression};'
+        if rng.random() < error_density:
+            choice = rng.randrange(4)
+            if choice == 0:
+                line = f'no_declarada{i} = {expression};'
+            elif choice == 1:
+                line = line[:-1]                          # falta ';'
+            else:
+                line = f'{rng.choice(names)} = {_break_expression(rng, expression, " ")};'
+        lines.append(line)
+        if i % 10 == 0:
+            lines.append('# comentario generado')
+    return '\n'.join(lines) + '\n'
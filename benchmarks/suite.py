@@ -0,0 +1,168 @@
+"""Benchmark de todas las etapas del compilador con entradas sintéticas.
+
+Cada etapa se cronometra por separado (mejor de --repeat ejecuciones) y se
+vuelve a ejecutar una vez con tracemalloc para medir el pico de memoria. Los
+resultados se comparan con un archivo de línea base: una etapa más lenta o
+con más memoria que la base más la tolerancia se marca como regresión y el
+programa termina con código 1.
+
+Cada carpeta tiene su propio main.py, así que se cargan por ruta con nombres
+de módulo distintos.
+
+Uso: python benchmarks/suite.py [--size N] [--depth D] [--identifiers K]
+         [--errors P] [--seed S] [--repeat R] [--only ETAPA ...]
+         [--baseline ARCHIVO] [--save-baseline] [--tolerance 0.25]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from generator import generate_expressions, generate_program
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def load_module(folder, name, alias):
+    """Carga folder/name.py como el módulo alias (sin depender de sys.path)."""
+    path = os.path.join(ROOT, folder, f'{name}.py')
+    spec = importlib.util.spec_from_file_location(alias, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def each(function, items):
+    """Aplica function a cada entrada; las que tienen errores también cuentan."""
+    def run():
+        for item in items:
+            try:
+                function(item)
+            except Exception:
+                pass
+    return run
+
+
+def build_stages(args):
+    """Lista de (nombre, función sin argumentos, caracteres de entrada)."""
+    p1 = load_module('Practica 1', 'main', 'practica1_main')
+    ll1 = load_module('Practica 1', 'll1', 'practica1_ll1')
+    p2 = load_module('Practica 2', 'main', 'practica2_main')
+    p4 = load_module('Practica 4', 'main', 'practica4_main')
+    pt1 = load_module('PROYECTO FINAL PT 1', 'main', 'proyecto1_main')
+    pt2 = load_module('Proyecto Final parte 2', 'main', 'proyecto2_main')
+
+    count = max(1, args.size // 10)
+    common = dict(operators=20, depth=args.depth, error_density=args.errors, seed=args.seed)
+    # Practica 1 y 2 solo admiten números; Practica 2 no admite espacios entre tokens
+    numeric = generate_expressions(count, **common)
+    compact = generate_expressions(count, sep='', **common)
+    named = generate_expressions(count, identifiers=args.identifiers, **common)
+    program = generate_program(args.size, depth=args.depth, identifiers=args.identifiers,
+                               error_density=args.errors, seed=args.seed)
+
+    token_lists = []
+    for expression in numeric:
+        try:
+            token_lists.append(p1.lexer(expression))
+        except ValueError:
+            pass
+    ll1_parser = ll1.LL1Parser()
+    numeric_chars = sum(map(len, numeric))
+
+    return [
+        ('practica1_lexer', each(p1.lexer, numeric), numeric_chars),
+        ('practica1_parser', each(lambda tokens: p1.Parser(tokens).parse(), token_lists), numeric_chars),
+        ('practica1_ll1', each(ll1_parser.parse, token_lists), numeric_chars),
+        ('practica2_postfix', each(p2.parse_expression, compact), sum(map(len, compact))),
+        ('practica4_postfix', each(p4.parse_expression, named), sum(map(len, named))),
+        ('pt1_parse_source', lambda: pt1.parse_source(program), len(program)),
+        ('pt1_check_source', lambda: pt1.check_source(program), len(program)),
+        ('pt2_parse_and_generate', each(pt2.parse_and_generate, [program]), len(program)),
+    ]
+
+
+def measure(run, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def compare(results, baseline, tolerance):
+    """Líneas de comparación con la base y si hay alguna regresión."""
+    regressions = False
+    lines = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f'{name:<24} sin línea base')
+            continue
+        time_ratio = result['seconds'] / base['seconds']
+        memory_ratio = result['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1.0
+        flags = []
+        if time_ratio > 1 + tolerance:
+            flags.append('TIEMPO')
+        if memory_ratio > 1 + tolerance:
+            flags.append('MEMORIA')
+        regressions |= bool(flags)
+        mark = f'  <- REGRESIÓN ({", ".join(flags)})' if flags else ''
+        lines.append(f'{name:<24} tiempo x{time_ratio:5.2f}   memoria x{memory_ratio:5.2f}{mark}')
+    return lines, regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark de las etapas del compilador.')
+    arg_parser.add_argument('--size', type=int, default=20000, help='sentencias del programa generado')
+    arg_parser.add_argument('--depth', type=int, default=3, help='profundidad máxima de paréntesis')
+    arg_parser.add_argument('--identifiers', type=int, default=50, help='identificadores distintos')
+    arg_parser.add_argument('--errors', type=float, default=0.0, help='fracción de entradas con error')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--repeat', type=int, default=3, help='ejecuciones por etapa (se toma la mejor)')
+    arg_parser.add_argument('--only', nargs='*', help='etapas a medir (por defecto todas)')
+    arg_parser.add_argument('--baseline', default=BASELINE_PATH, help='archivo de línea base')
+    arg_parser.add_argument('--save-baseline', action='store_true', help='guarda los resultados como línea base')
+    arg_parser.add_argument('--tolerance', type=float, default=0.25, help='empeoramiento admitido (0.25 = 25%%)')
+    args = arg_parser.parse_args()
+    config = {key: getattr(args, key) for key in ('size', 'depth', 'identifiers', 'errors', 'seed')}
+
+    results = {}
+    print(f'{"etapa":<24} {"tiempo":>9} {"MB/s":>8} {"pico":>10}')
+    for name, run, chars in build_stages(args):
+        if args.only and name not in args.only:
+            continue
+        seconds, peak = measure(run, args.repeat)
+        results[name] = {'seconds': seconds, 'chars': chars, 'peak_bytes': peak}
+        print(f'{name:<24} {seconds:8.3f}s {chars / seconds / 1e6:8.2f} {peak / 1024:8.0f} KiB')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'config': config, 'results': results}, f, indent=2)
+            f.write('\n')
+        print(f'Línea base guardada en {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print('Sin línea base: ejecuta con --save-baseline para crearla')
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print()
+    if baseline.get('config') != config:
+        print(f'Aviso: la línea base se midió con otra configuración: {baseline.get("config")}')
+    lines, regressions = compare(results, baseline['results'], args.tolerance)
+    print('\n'.join(lines))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())